@@ -0,0 +1,84 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from src.config import settings
+from src.database import Base
+from src.tenancy import validate_schema
+from src.api_admin.models import *  # noqa: F401, F403
+
+
+# Ревизии этого каталога применяются к одной схеме арендатора: таблицы
+# в них без схемы, search_path соединения указывает на схему арендатора,
+# а версия хранится в её собственной таблице alembic_version.
+config = context.config
+
+section = config.config_ini_section
+config.set_section_option(section, "DB_HOST", settings.DB_HOST)
+config.set_section_option(section, "DB_PORT", str(settings.DB_PORT))
+config.set_section_option(section, "DB_USER", settings.DB_USER)
+config.set_section_option(section, "DB_NAME", settings.DB_NAME)
+config.set_section_option(section, "DB_PASS", settings.DB_PASS)
+
+if (
+    config.config_file_name is not None and
+    config.attributes.get("configure_logger", True)
+):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+schema = validate_schema(
+    config.attributes.get("tenant_schema") or
+    context.get_x_argument(as_dictionary=True).get("schema", "")
+)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table":
+        return object.schema is None
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        version_table_schema=schema,
+        include_object=include_object,
+    )
+
+    context.execute(f'SET search_path TO "{schema}"')
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        # Не SET LOCAL: search_path должен пережить autocommit_block.
+        connection.exec_driver_sql(f'SET search_path TO "{schema}"')
+        connection.commit()
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            version_table_schema=schema,
+            include_object=include_object,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
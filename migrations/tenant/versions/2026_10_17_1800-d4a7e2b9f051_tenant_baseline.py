@@ -0,0 +1,29 @@
+"""tenant baseline
+
+Revision ID: d4a7e2b9f051
+Revises:
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7e2b9f051'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Схемы арендаторов в состоянии после ревизии c93a5f1d7e62 основной
+# ветки: до неё изменения таблиц арендаторов вносились миграциями
+# public циклом по схемам. Схемы без alembic_version раннер помечает
+# этой ревизией перед обновлением.
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
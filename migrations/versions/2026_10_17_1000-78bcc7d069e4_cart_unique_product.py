@@ -0,0 +1,64 @@
+"""cart unique product
+
+Revision ID: 78bcc7d069e4
+Revises: 6c2db5d61f93
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '78bcc7d069e4'
+down_revision: Union[str, None] = '6c2db5d61f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def tenant_schemas() -> list[str]:
+    return op.get_bind().execute(sa.text(
+        "SELECT n.nspname FROM pg_namespace n "
+        "JOIN public.users u ON n.nspname = u.id::text "
+        "WHERE to_regclass(quote_ident(n.nspname) || '.cart') IS NOT NULL"
+    )).scalars().all()
+
+
+def upgrade() -> None:
+    for schema in tenant_schemas():
+        # Склеиваем дубли, которые могли появиться из-за гонки
+        # select-then-insert, иначе ограничение не создать.
+        op.execute(
+            f'UPDATE "{schema}".cart c SET quantity = d.quantity '
+            f'FROM (SELECT min(id) AS id, sum(quantity) AS quantity '
+            f'FROM "{schema}".cart '
+            f'GROUP BY store_id, tg_user_id, product_id '
+            f'HAVING count(*) > 1) d '
+            f'WHERE c.id = d.id'
+        )
+        op.execute(
+            f'DELETE FROM "{schema}".cart c '
+            f'USING "{schema}".cart d '
+            f'WHERE c.store_id = d.store_id '
+            f'AND c.tg_user_id = d.tg_user_id '
+            f'AND c.product_id = d.product_id '
+            f'AND c.id > d.id'
+        )
+        op.create_unique_constraint(
+            'uq_cart_store_tg_user_product',
+            'cart',
+            ['store_id', 'tg_user_id', 'product_id'],
+            schema=schema
+        )
+
+
+def downgrade() -> None:
+    for schema in tenant_schemas():
+        op.drop_constraint(
+            'uq_cart_store_tg_user_product',
+            'cart',
+            type_='unique',
+            schema=schema
+        )
@@ -0,0 +1,42 @@
+"""outbox messages
+
+Revision ID: db95e8917997
+Revises: 78bcc7d069e4
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'db95e8917997'
+down_revision: Union[str, None] = '78bcc7d069e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_messages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=64), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=64), server_default=sa.text("'pending'"), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('available_at', sa.DateTime(), server_default=sa.text("TIMEZONE('utc', now())"), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text("TIMEZONE('utc', now())"), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    schema='public'
+    )
+    op.create_index(op.f('ix_public_outbox_messages_id'), 'outbox_messages', ['id'], unique=False, schema='public')
+    op.create_index('ix_outbox_messages_pending', 'outbox_messages', ['available_at'], unique=False, schema='public', postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_messages_pending', table_name='outbox_messages', schema='public', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_index(op.f('ix_public_outbox_messages_id'), table_name='outbox_messages', schema='public')
+    op.drop_table('outbox_messages', schema='public')
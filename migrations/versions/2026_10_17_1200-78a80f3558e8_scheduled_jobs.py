@@ -0,0 +1,42 @@
+"""scheduled jobs
+
+Revision ID: 78a80f3558e8
+Revises: db95e8917997
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '78a80f3558e8'
+down_revision: Union[str, None] = 'db95e8917997'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('scheduled_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=64), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('run_at', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.String(length=64), server_default=sa.text("'pending'"), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text("TIMEZONE('utc', now())"), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    schema='public'
+    )
+    op.create_index(op.f('ix_public_scheduled_jobs_id'), 'scheduled_jobs', ['id'], unique=False, schema='public')
+    op.create_index('ix_scheduled_jobs_pending', 'scheduled_jobs', ['run_at'], unique=False, schema='public', postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scheduled_jobs_pending', table_name='scheduled_jobs', schema='public', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_index(op.f('ix_public_scheduled_jobs_id'), table_name='scheduled_jobs', schema='public')
+    op.drop_table('scheduled_jobs', schema='public')
@@ -0,0 +1,46 @@
+"""broadcasts
+
+Revision ID: 3f1c9a2e7b54
+Revises: 78a80f3558e8
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a2e7b54'
+down_revision: Union[str, None] = '78a80f3558e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('broadcasts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('store_id', sa.Integer(), nullable=False),
+    sa.Column('mail_text', sa.String(length=4048), nullable=False),
+    sa.Column('photo_url', sa.String(), nullable=True),
+    sa.Column('status', sa.String(length=64), server_default=sa.text("'pending'"), nullable=False),
+    sa.Column('total', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('sent', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('failed', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('last_customer_id', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text("TIMEZONE('utc', now())"), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['public.users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    schema='public'
+    )
+    op.create_index(op.f('ix_public_broadcasts_id'), 'broadcasts', ['id'], unique=False, schema='public')
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_public_broadcasts_id'), table_name='broadcasts', schema='public')
+    op.drop_table('broadcasts', schema='public')
@@ -0,0 +1,41 @@
+"""mail image file_id
+
+Revision ID: a4d2c8e61f07
+Revises: 3f1c9a2e7b54
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d2c8e61f07'
+down_revision: Union[str, None] = '3f1c9a2e7b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def tenant_schemas() -> list[str]:
+    return op.get_bind().execute(sa.text(
+        "SELECT n.nspname FROM pg_namespace n "
+        "JOIN public.users u ON n.nspname = u.id::text "
+        "WHERE to_regclass(quote_ident(n.nspname) || '.mail_images') "
+        "IS NOT NULL"
+    )).scalars().all()
+
+
+def upgrade() -> None:
+    op.add_column('broadcasts', sa.Column('photo_file_id', sa.String(), nullable=True), schema='public')
+    for schema in tenant_schemas():
+        op.add_column('mail_images', sa.Column('tg_file_id', sa.String(), nullable=True), schema=schema)
+        op.add_column('mail_images', sa.Column('tg_bot_id', sa.BIGINT(), nullable=True), schema=schema)
+
+
+def downgrade() -> None:
+    for schema in tenant_schemas():
+        op.drop_column('mail_images', 'tg_bot_id', schema=schema)
+        op.drop_column('mail_images', 'tg_file_id', schema=schema)
+    op.drop_column('broadcasts', 'photo_file_id', schema='public')
@@ -0,0 +1,84 @@
+"""daily sales rollups
+
+Revision ID: 5e7b9d3c2a18
+Revises: a4d2c8e61f07
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7b9d3c2a18'
+down_revision: Union[str, None] = 'a4d2c8e61f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def tenant_schemas() -> list[str]:
+    return op.get_bind().execute(sa.text(
+        "SELECT n.nspname FROM pg_namespace n "
+        "JOIN public.users u ON n.nspname = u.id::text "
+        "WHERE to_regclass(quote_ident(n.nspname) || '.order_details') "
+        "IS NOT NULL"
+    )).scalars().all()
+
+
+def upgrade() -> None:
+    for schema in tenant_schemas():
+        op.create_table('daily_product_sales',
+        sa.Column('store_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('total_sales', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['store_id'], [f'{schema}.stores.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], [f'{schema}.products.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['category_id'], [f'{schema}.categories.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('store_id', 'day', 'product_id'),
+        schema=schema
+        )
+        op.create_table('daily_customer_sales',
+        sa.Column('store_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('tg_user_id', sa.BIGINT(), nullable=False),
+        sa.Column('orders_count', sa.Integer(), nullable=False),
+        sa.Column('total_sales', sa.Float(), nullable=False),
+        sa.Column('last_order_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['store_id', 'tg_user_id'], [f'{schema}.customers.store_id', f'{schema}.customers.tg_user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('store_id', 'day', 'tg_user_id'),
+        schema=schema
+        )
+        # Сводки за прошлые дни собираются из уже оформленных заказов,
+        # дальше их обновляет оформление заказа.
+        op.execute(
+            f'INSERT INTO "{schema}".daily_product_sales '
+            f'(store_id, day, product_id, category_id, quantity, total_sales) '
+            f'SELECT d.store_id, o.created_at::date, d.product_id, '
+            f'min(p.category_id), sum(d.quantity), sum(d.unit_price) '
+            f'FROM "{schema}".order_details d '
+            f'JOIN "{schema}".orders o ON o.id = d.order_id '
+            f'JOIN "{schema}".products p ON p.id = d.product_id '
+            f'GROUP BY d.store_id, o.created_at::date, d.product_id'
+        )
+        op.execute(
+            f'INSERT INTO "{schema}".daily_customer_sales '
+            f'(store_id, day, tg_user_id, orders_count, total_sales, '
+            f'last_order_at) '
+            f'SELECT o.store_id, o.created_at::date, o.tg_user_id, '
+            f'count(DISTINCT o.id), coalesce(sum(d.unit_price), 0), '
+            f'max(o.created_at) '
+            f'FROM "{schema}".orders o '
+            f'LEFT JOIN "{schema}".order_details d ON d.order_id = o.id '
+            f'GROUP BY o.store_id, o.created_at::date, o.tg_user_id'
+        )
+
+
+def downgrade() -> None:
+    for schema in tenant_schemas():
+        op.drop_table('daily_customer_sales', schema=schema)
+        op.drop_table('daily_product_sales', schema=schema)
@@ -0,0 +1,85 @@
+"""order detail line total
+
+Revision ID: b81f4e6a9c35
+Revises: 5e7b9d3c2a18
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f4e6a9c35'
+down_revision: Union[str, None] = '5e7b9d3c2a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 5000
+
+
+def tenant_schemas() -> list[str]:
+    return op.get_bind().execute(sa.text(
+        "SELECT n.nspname FROM pg_namespace n "
+        "JOIN public.users u ON n.nspname = u.id::text "
+        "WHERE to_regclass(quote_ident(n.nspname) || '.order_details') "
+        "IS NOT NULL"
+    )).scalars().all()
+
+
+def backfill_line_total(schema: str):
+    # До этой ревизии unit_price хранил сумму по позиции. Переносим её в
+    # line_total, а в unit_price оставляем цену за единицу. Пачки
+    # коммитятся по отдельности, поэтому блокировки строк короткие, а
+    # прерванный перенос продолжается с того же места.
+    bind = op.get_bind()
+    while True:
+        result = bind.execute(sa.text(
+            f'UPDATE "{schema}".order_details d '
+            f'SET line_total = d.unit_price, '
+            f'unit_price = CASE WHEN d.quantity > 0 '
+            f'THEN d.unit_price / d.quantity ELSE d.unit_price END '
+            f'WHERE d.id IN ('
+            f'SELECT id FROM "{schema}".order_details '
+            f'WHERE line_total IS NULL ORDER BY id LIMIT :batch_size)'
+        ), {"batch_size": BATCH_SIZE})
+        if result.rowcount == 0:
+            break
+
+
+def upgrade() -> None:
+    # Колонка и индексы создаются с IF NOT EXISTS: autocommit_block
+    # фиксирует add_column, и после сбоя ревизия запускается повторно.
+    schemas = tenant_schemas()
+    for schema in schemas:
+        op.execute(f'ALTER TABLE "{schema}".order_details ADD COLUMN IF NOT EXISTS line_total double precision')
+    with op.get_context().autocommit_block():
+        for schema in schemas:
+            backfill_line_total(schema)
+            op.create_index('ix_order_details_store_id_created_at', 'order_details', ['store_id', 'created_at'], unique=False, schema=schema, if_not_exists=True, postgresql_include=['product_id', 'quantity', 'line_total'], postgresql_concurrently=True)
+            op.create_index('ix_daily_product_sales_store_id_day', 'daily_product_sales', ['store_id', 'day'], unique=False, schema=schema, if_not_exists=True, postgresql_include=['product_id', 'category_id', 'total_sales'], postgresql_concurrently=True)
+            op.create_index('ix_daily_customer_sales_store_id_day', 'daily_customer_sales', ['store_id', 'day'], unique=False, schema=schema, if_not_exists=True, postgresql_include=['tg_user_id', 'total_sales', 'last_order_at'], postgresql_concurrently=True)
+    for schema in schemas:
+        # Строки, вставленные во время переноса, добираем под блокировкой,
+        # чтобы SET NOT NULL не упал на них.
+        op.execute(f'LOCK TABLE "{schema}".order_details IN SHARE ROW EXCLUSIVE MODE')
+        op.execute(
+            f'UPDATE "{schema}".order_details '
+            f'SET line_total = unit_price, '
+            f'unit_price = CASE WHEN quantity > 0 '
+            f'THEN unit_price / quantity ELSE unit_price END '
+            f'WHERE line_total IS NULL'
+        )
+        op.alter_column('order_details', 'line_total', existing_type=sa.Float(), nullable=False, schema=schema)
+
+
+def downgrade() -> None:
+    for schema in tenant_schemas():
+        op.drop_index('ix_daily_customer_sales_store_id_day', table_name='daily_customer_sales', schema=schema)
+        op.drop_index('ix_daily_product_sales_store_id_day', table_name='daily_product_sales', schema=schema)
+        op.drop_index('ix_order_details_store_id_created_at', table_name='order_details', schema=schema)
+        op.execute(f'UPDATE "{schema}".order_details SET unit_price = line_total')
+        op.drop_column('order_details', 'line_total', schema=schema)
@@ -0,0 +1,51 @@
+"""tenant hot path indexes
+
+Revision ID: c93a5f1d7e62
+Revises: b81f4e6a9c35
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c93a5f1d7e62'
+down_revision: Union[str, None] = 'b81f4e6a9c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def tenant_schemas() -> list[str]:
+    return op.get_bind().execute(sa.text(
+        "SELECT n.nspname FROM pg_namespace n "
+        "JOIN public.users u ON n.nspname = u.id::text "
+        "WHERE to_regclass(quote_ident(n.nspname) || '.products') "
+        "IS NOT NULL"
+    )).scalars().all()
+
+
+def upgrade() -> None:
+    # Индексы строятся CONCURRENTLY, чтобы не блокировать запись в
+    # таблицы арендаторов. Корзина уже покрыта уникальным индексом
+    # uq_cart_store_tg_user_product, order_details (store_id, created_at) -
+    # индексом ix_order_details_store_id_created_at.
+    schemas = tenant_schemas()
+    with op.get_context().autocommit_block():
+        for schema in schemas:
+            op.create_index('ix_products_store_id_popular_id', 'products', ['store_id', sa.text('popular DESC'), sa.text('id DESC')], unique=False, schema=schema, if_not_exists=True, postgresql_where=sa.text('deleted_flag IS false'), postgresql_concurrently=True)
+            op.create_index('ix_categories_store_id_id', 'categories', ['store_id', sa.text('id DESC')], unique=False, schema=schema, if_not_exists=True, postgresql_where=sa.text('deleted_flag IS false'), postgresql_concurrently=True)
+            op.create_index('ix_customers_store_id_id', 'customers', ['store_id', 'id'], unique=False, schema=schema, if_not_exists=True, postgresql_concurrently=True)
+            op.create_index('ix_orders_store_id_id', 'orders', ['store_id', 'id'], unique=False, schema=schema, if_not_exists=True, postgresql_concurrently=True)
+            op.create_index('ix_order_details_store_id_id', 'order_details', ['store_id', 'id'], unique=False, schema=schema, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    for schema in tenant_schemas():
+        op.drop_index('ix_order_details_store_id_id', table_name='order_details', schema=schema)
+        op.drop_index('ix_orders_store_id_id', table_name='orders', schema=schema)
+        op.drop_index('ix_customers_store_id_id', table_name='customers', schema=schema)
+        op.drop_index('ix_categories_store_id_id', table_name='categories', schema=schema)
+        op.drop_index('ix_products_store_id_popular_id', table_name='products', schema=schema)
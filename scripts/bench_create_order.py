@@ -0,0 +1,147 @@
+"""
+Сравнение оформления заказа: прежняя последовательность запросов
+(выборка корзины, INSERT заказа, позиций и данных покупателя, удаление
+корзины) и place_order одним запросом с CTE.
+
+Нужна база с данными арендатора: покупатель и товары магазина должны
+существовать. Каждая итерация заполняет корзину и откатывается, данные
+не меняются.
+
+    PYTHONPATH=. python scripts/bench_create_order.py --schema 1 \\
+        --store-id 1 --tg-user-id 123 --product-ids 1 2 3 --iterations 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.sql import func
+
+import src.bot.services  # noqa: F401
+from src.api_admin.models import (
+    Cart,
+    Order,
+    OrderCustomerInfo,
+    OrderDetail,
+    Product
+)
+from src.api_admin.cart.data_access import place_order, sync_cart
+from src.api_admin.cart.schemas import (
+    CartSync,
+    CreateCustomerInfo,
+    CreateOrder
+)
+from src.database import async_session_maker, engine
+from src.tenancy import use_tenant
+
+
+async def legacy_create_order(session, data_order, customer_info, schema):
+    await use_tenant(session, schema)
+    store_id = data_order.store_id
+    tg_user_id = data_order.tg_user_id
+    cart_items = (await session.execute(
+        select(
+            Cart.product_id,
+            Cart.quantity,
+            Product.price.label("unit_price"),
+            (Product.price * Cart.quantity).label("line_total"),
+            func.sum(Cart.quantity * Product.price).over()
+        ).
+        join(Cart, Cart.product_id == Product.id).
+        filter(Cart.tg_user_id == tg_user_id, Cart.store_id == store_id)
+    )).all()
+    result = await session.execute(
+        insert(Order).
+        values(**data_order.model_dump()).
+        returning(Order.id)
+    )
+    order_id = result.scalar()
+    await session.execute(
+        insert(OrderDetail).
+        values([
+            {
+                "store_id": store_id,
+                "order_id": order_id,
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "line_total": item.line_total
+            }
+            for item in cart_items
+        ])
+    )
+    await session.execute(
+        insert(OrderCustomerInfo).
+        values(
+            **customer_info.model_dump(),
+            store_id=store_id,
+            tg_user_id=tg_user_id,
+            order_id=order_id
+        )
+    )
+    await session.execute(
+        delete(Cart).
+        where(Cart.tg_user_id == tg_user_id, Cart.store_id == store_id)
+    )
+
+
+async def run(method, args, counter):
+    data_order = CreateOrder(
+        tg_user_id=args.tg_user_id,
+        store_id=args.store_id,
+        order_type_id=args.order_type_id
+    )
+    customer_info = CreateCustomerInfo(customer_name="bench")
+    cart = CartSync(
+        tg_user_id=args.tg_user_id,
+        store_id=args.store_id,
+        items=[
+            {"product_id": product_id, "quantity": 1}
+            for product_id in args.product_ids
+        ]
+    )
+    timings = []
+    statements = 0
+    for _ in range(args.iterations):
+        async with async_session_maker() as session:
+            await sync_cart(session, cart, args.schema)
+            counter["statements"] = 0
+            started = time.perf_counter()
+            await method(session, data_order, customer_info, args.schema)
+            timings.append((time.perf_counter() - started) * 1000)
+            statements = counter["statements"]
+            await session.rollback()
+    return {
+        "statements": statements,
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(
+            statistics.quantiles(timings, n=20)[-1], 3),
+    }
+
+
+async def main(args):
+    counter = {"statements": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+    for name, method in (
+        ("legacy", legacy_create_order),
+        ("place_order", place_order),
+    ):
+        print(name, await run(method, args, counter))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--schema", required=True)
+    parser.add_argument("--store-id", type=int, required=True)
+    parser.add_argument("--tg-user-id", type=int, required=True)
+    parser.add_argument("--order-type-id", type=int, default=1)
+    parser.add_argument("--product-ids", type=int, nargs="+", required=True)
+    parser.add_argument("--iterations", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,143 @@
+"""
+Проверка планов горячих запросов к таблицам арендатора: каждый должен
+идти по своему индексу, а отсортированные - без отдельной сортировки.
+
+Таблицы арендатора в тестовой базе обычно маленькие, и планировщик
+предпочёл бы последовательное чтение, поэтому проверка выполняется с
+enable_seqscan = off: так проверяется, что индекс вообще подходит к
+запросу. Код выхода 1, если хотя бы один план не совпал.
+
+    PYTHONPATH=. python scripts/explain_hot_paths.py --schema 1
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import sys
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+import src.bot.services  # noqa: F401
+from src.api_admin.models import (
+    Cart,
+    Category,
+    DailyProductSales,
+    Order,
+    OrderDetail,
+    Product
+)
+from src.database import async_session_maker, engine
+from src.tenancy import use_tenant
+
+
+def hot_paths(store_id: int, tg_user_id: int):
+    since = datetime.datetime(2000, 1, 1)
+    return [
+        (
+            "storefront products",
+            select(Product).
+            where(
+                Product.deleted_flag.is_(False),
+                Product.store_id == store_id
+            ).
+            order_by(Product.popular.desc(), Product.id.desc()),
+            "ix_products_store_id_popular_id",
+            True
+        ),
+        (
+            "store categories",
+            select(Category).
+            where(Category.deleted_flag.is_(False)).
+            where(Category.store_id == store_id).
+            order_by(Category.id.desc()),
+            "ix_categories_store_id_id",
+            True
+        ),
+        (
+            "customer cart",
+            select(Cart).
+            where(Cart.tg_user_id == tg_user_id, Cart.store_id == store_id),
+            "uq_cart_store_tg_user_product",
+            False
+        ),
+        (
+            "orders page",
+            select(Order).
+            where(Order.store_id == store_id, Order.id < 1000000).
+            order_by(Order.id.desc()).
+            limit(101),
+            "ix_orders_store_id_id",
+            True
+        ),
+        (
+            "order details by period",
+            select(OrderDetail.product_id, OrderDetail.line_total).
+            where(
+                OrderDetail.store_id == store_id,
+                OrderDetail.created_at >= since
+            ),
+            "ix_order_details_store_id_created_at",
+            False
+        ),
+        (
+            "daily product sales by period",
+            select(
+                DailyProductSales.product_id,
+                DailyProductSales.total_sales
+            ).
+            where(
+                DailyProductSales.store_id == store_id,
+                DailyProductSales.day >= since.date()
+            ),
+            "ix_daily_product_sales_store_id_day",
+            False
+        ),
+    ]
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def main(args) -> int:
+    failed = 0
+    async with async_session_maker() as session:
+        await use_tenant(session, args.schema)
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        for name, query, index_name, ordered in hot_paths(
+            args.store_id, args.tg_user_id
+        ):
+            sql = query.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True}
+            )
+            # Через exec_driver_sql: text() принял бы ":00" во
+            # встроенных литералах времени за параметры.
+            connection = await session.connection()
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodes = list(plan_nodes(plan[0]["Plan"]))
+            indexes = {node.get("Index Name") for node in nodes}
+            sorted_ = any(node["Node Type"] == "Sort" for node in nodes)
+            ok = index_name in indexes and not (ordered and sorted_)
+            failed += not ok
+            print(f"{'ok' if ok else 'FAIL':4} {name}: "
+                  f"{', '.join(sorted(filter(None, indexes))) or 'no index'}"
+                  f"{' + sort' if sorted_ else ''}")
+        await session.rollback()
+    await engine.dispose()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--schema", required=True)
+    parser.add_argument("--store-id", type=int, default=1)
+    parser.add_argument("--tg-user-id", type=int, default=1)
+    sys.exit(asyncio.run(main(parser.parse_args())))
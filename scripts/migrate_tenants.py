@@ -0,0 +1,37 @@
+"""
+Применяет ревизии migrations/tenant ко всем схемам арендаторов.
+
+    PYTHONPATH=. python scripts/migrate_tenants.py --workers 8
+    PYTHONPATH=. python scripts/migrate_tenants.py --schema 12 --schema 15
+
+Каждая схема хранит свою версию в alembic_version, поэтому после ошибки
+достаточно запустить раннер ещё раз: обновлённые схемы будут пропущены.
+Код выхода 1, если хотя бы одна схема не обновилась.
+"""
+import argparse
+import logging
+import sys
+
+from src.tenant_migrations import upgrade_tenant_schemas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--revision", default="heads")
+    parser.add_argument("--schema", action="append", dest="schemas")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(levelname)-5.5s %(message)s")
+    results = upgrade_tenant_schemas(
+        revision=args.revision,
+        schemas=args.schemas,
+        workers=args.workers
+    )
+    failed = [result for result in results if result.error]
+    print(f"{len(results) - len(failed)} schemas migrated, "
+          f"{len(failed)} failed")
+    for result in failed:
+        print(f"{result.schema}: {result.error}")
+    sys.exit(1 if failed else 0)
@@ -1,6 +1,7 @@
+import hashlib
 from jwt.exceptions import ExpiredSignatureError
 import jwt
-from typing import List
+from typing import AsyncGenerator, List
 from jose import JWTError
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Response
@@ -8,9 +9,11 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.secure import pwd_context, oauth2_scheme
+from src.cache import cache
+from src.secure import oauth2_scheme, verify_password
 from src.config import settings
 from src.database import get_async_session
+from src.tenancy import use_tenant
 from ..models import User
 from .schemas import TokenCreate, UserAuth
 
@@ -44,9 +47,14 @@ async def create_token(
             status_code=404,
             detail="User not found"
         )
-    if not pwd_context.verify(user_data.password, user.hashed_password):
+    verified, new_hash = await verify_password(
+        user_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=400, detail="Incorrect username or password")
+    if new_hash:
+        user.hashed_password = new_hash
+        await session.commit()
     token_data = {"sub": user_data.username}
     jwt_token = create_jwt_token(token_data)
     response.set_cookie(key="access_token", value=jwt_token, expires=3600)
@@ -56,6 +64,19 @@ async def create_token(
     }
 
 
+def principal_cache_key(username: str, token: str) -> str:
+    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    return f"auth:{username}:{token_hash}"
+
+
+async def invalidate_principals(username: str):
+    """
+    Сбрасывает закэшированных пользователей для всех токенов username,
+    например после смены пароля или данных пользователя.
+    """
+    await cache.delete_prefix(f"auth:{username}:")
+
+
 async def get_user(
     username: str,
     session: AsyncSession = Depends(get_async_session)
@@ -105,8 +126,13 @@ async def get_current_user_from_token(
             detail="Требуется вход",
         )
 
+    cache_key = principal_cache_key(username, token)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return UserAuth.model_validate(cached)
+
     user = await get_user(username=username, session=session)
-    if user is None:
+    if not user:
         raise credentials_exception
 
     user_response = UserAuth(
@@ -118,9 +144,27 @@ async def get_current_user_from_token(
         role_id=user[0].role_id
     )
 
+    ttl = settings.AUTH_CACHE_TTL
+    if expiration is not None:
+        ttl = min(ttl, expiration - datetime.utcnow().timestamp())
+    if ttl > 0:
+        await cache.set(cache_key, user_response.model_dump(), ttl=ttl)
+
     return user_response
 
 
+async def get_tenant_session(
+    current_user: UserAuth = Depends(get_current_user_from_token),
+    session: AsyncSession = Depends(get_async_session)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия, привязанная к схеме текущего пользователя. Запросы к таблицам
+    арендатора выполняются без schema_translate_map.
+    """
+    await use_tenant(session, str(current_user.id))
+    yield session
+
+
 @router.get("/logit/test/",)
 async def read_items(
     current_user: User = Depends(get_current_user_from_token)
@@ -131,8 +175,10 @@ async def read_items(
 @router.post("/logout")
 async def logout(
     response: Response,
+    token: str = Depends(oauth2_scheme),
     current_user: User = Depends(get_current_user_from_token)
 ):
+    await cache.delete(principal_cache_key(current_user.username, token))
     response.delete_cookie(key="access_token")
     return {"message": "Вы успешно вышли"}
 
@@ -1,166 +1,310 @@
-import asyncio
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import insert, select, update, delete
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import (
+    insert, select, update, delete, literal, literal_column, true, union_all
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.sql import func
 
-from aiogram import Bot
-from aiogram.types import InlineKeyboardButton
-from aiogram.utils.keyboard import InlineKeyboardBuilder
-from aiogram.enums import ParseMode
-from typing import List, Optional
-
 from ..models import (
     Product,
     Cart,
-    BotToken,
     Order,
     OrderDetail,
-    StoreInfo,
     OrderCustomerInfo
 )
-from .schemas import (
-    CartResponse,
-    CartCreate,
-    CreateOrder,
-    CreateCustomerInfo,
-    CartItem
-)
-from src.api_admin.product.schemas import ProductListStore, ProductOne
-from src.api_admin.category.schemas import CategoryBaseStore
-from src.api_admin.category.crud import crud_get_all_categories
-from src.database import get_async_session
-from src.bot.handlers import (
-    new_order_mess_text_order_chat,
-    new_order_mess_text_customer
-)
-from src.bot.keyboards import (
-    create_order_acceptance_keyboard,
-    create_order_cancellation_keyboard
+from .schemas import CartSync, CartItem
+from src.api_admin.order.rollups import (
+    upsert_customer_sales,
+    upsert_product_sales
 )
+from src.tenancy import use_tenant
 
 
-async def get_cart_items(session, tg_user_id, store_id, schema):
-    cart_query = (
+def select_cart_totals(changed, tg_user_id, store_id, product_id):
+    # CTE с INSERT/UPDATE/DELETE не виден остальной части запроса,
+    # поэтому изменённую строку подставляем вместо строки из таблицы.
+    items = union_all(
+        select(Cart.product_id, Cart.quantity).
+        where(
+            Cart.tg_user_id == tg_user_id,
+            Cart.store_id == store_id,
+            Cart.product_id != product_id
+        ),
+        select(changed.c.product_id, changed.c.quantity)
+    ).subquery("items")
+    return (
         select(
-            Cart.product_id,
-            Cart.quantity,
-            Product.name.label("product_name"),
-            (Product.price * Cart.quantity).label("unit_price"),
-            func.sum(Cart.quantity * Product.price).over().label("total_price")
-        )
-        .join(Cart, Cart.product_id == Product.id)
-        .filter(Cart.tg_user_id == tg_user_id, Cart.store_id == store_id)
-        .execution_options(schema_translate_map={None: schema})
+            select(func.sum(changed.c.quantity)).
+            scalar_subquery().label("quantity"),
+            func.coalesce(
+                func.sum(items.c.quantity * Product.price), 0
+            ).label("total_price"),
+            func.coalesce(
+                func.sum(items.c.quantity), 0
+            ).label("total_quantity")
+        ).
+        select_from(items).
+        join(Product, Product.id == items.c.product_id)
     )
-    result = await session.execute(cart_query)
-    return result.scalars().all()
 
 
-async def create_order_record(session, data_order, schema):
-    stmt_order = (
-        insert(Order)
-        .values(**data_order.model_dump())
-        .returning(Order.id)
-        .execution_options(schema_translate_map={None: schema})
+async def add_cart_item(session, data, schema):
+    await use_tenant(session, schema)
+    changed = (
+        pg_insert(Cart).
+        values(**data.model_dump(), quantity=1).
+        on_conflict_do_update(
+            constraint="uq_cart_store_tg_user_product",
+            set_={"quantity": Cart.quantity + 1}
+        ).
+        returning(Cart.product_id, Cart.quantity).
+        cte("changed")
     )
-    result = await session.execute(stmt_order)
-    return result.scalar()
-
-
-def format_order_text(cart_items):
-    order_text = ""
-    for item in cart_items:
-        order_text += f"{item['product_name']} x {item['quantity']}\n"
-    return order_text
-
-
-async def get_bot_token(session, schema, store_id):
-    query_token_bot = (
-        select(BotToken)
-        .where(BotToken.user_id == int(schema), BotToken.store_id == store_id)
+    query = (
+        select_cart_totals(
+            changed, data.tg_user_id, data.store_id, data.product_id)
     )
-    result = await session.execute(query_token_bot)
-    return result.scalar().token_bot
+    result = await session.execute(query)
+    return result.one()
 
 
-async def update_order_details(session, values_list, schema):
-    stmt_order_detail = (
-        insert(OrderDetail)
-        .values(values_list)
-        .execution_options(schema_translate_map={None: schema})
+async def decrease_cart_item_quantity(session, data, schema):
+    await use_tenant(session, schema)
+    where_item = (
+        Cart.tg_user_id == data.tg_user_id,
+        Cart.store_id == data.store_id,
+        Cart.product_id == data.product_id
     )
-    await session.execute(stmt_order_detail)
-
-
-async def clear_cart(session, tg_user_id, store_id, schema):
-    stmt = (
-        delete(Cart)
-        .where(Cart.tg_user_id == tg_user_id, Cart.store_id == store_id)
-        .execution_options(schema_translate_map={None: schema})
+    decreased = (
+        update(Cart).
+        where(*where_item, Cart.quantity > 1).
+        values(quantity=Cart.quantity - 1).
+        returning(Cart.product_id, Cart.quantity).
+        cte("decreased")
     )
-    await session.execute(stmt)
+    deleted = (
+        delete(Cart).
+        where(*where_item, Cart.quantity <= 1).
+        returning(Cart.product_id, literal_column("0").label("quantity")).
+        cte("deleted")
+    )
+    changed = union_all(
+        select(decreased.c.product_id, decreased.c.quantity),
+        select(deleted.c.product_id, deleted.c.quantity)
+    ).cte("changed")
+    query = (
+        select_cart_totals(
+            changed, data.tg_user_id, data.store_id, data.product_id)
+    )
+    result = await session.execute(query)
+    return result.one()
 
 
-async def remove_keyboard_later(
-    token_bot: str,
-    chat_id: int,
-    message_id: int,
-    delay: int
-):
-    await asyncio.sleep(delay)
-    try:
-        bot = Bot(token=token_bot)
-        await bot.edit_message_reply_markup(
-            chat_id=chat_id,
-            message_id=message_id,
-            reply_markup=None
-        )
-    except Exception as e:
-        print(f"Ошибка при удалении клавиатуры: {e}")
-    finally:
-        await bot.session.close()
+def literal_values(model, values: dict):
+    # Типы берутся из столбцов, чтобы asyncpg привёл параметры к BIGINT
+    # и т.п., а не к типу по умолчанию для значения Python.
+    columns = model.__table__.c
+    return [
+        literal(value, columns[key].type).label(key)
+        for key, value in values.items()
+    ]
 
 
-async def send_message(
-    chat_id: int,
-    text: str,
-    token_bot: str,
-    url=None,
-    reply_markup=None
-):
-    try:
-        bot = Bot(token=token_bot)
-        if url:
-            reply_markup = create_keyboard(
-                url=url)
-        message = await bot.send_message(
-            chat_id,
-            text,
-            reply_markup=reply_markup,
-            parse_mode=ParseMode.MARKDOWN
+async def place_order(session, data_order, customer_info, schema):
+    """
+    Оформляет заказ одним запросом: корзина удаляется с RETURNING, а из
+    удалённых строк в CTE создаются заказ, его позиции и данные
+    покупателя и обновляются дневные сводки продаж. Возвращает позиции
+    заказа с id заказа и суммой; пустой список, если корзина пуста и
+    заказ не создан.
+    """
+    await use_tenant(session, schema)
+    store_id = data_order.store_id
+    tg_user_id = data_order.tg_user_id
+    cart_rows = (
+        delete(Cart).
+        where(Cart.tg_user_id == tg_user_id, Cart.store_id == store_id).
+        returning(Cart.product_id, Cart.quantity).
+        cte("cart_rows")
+    )
+    items = (
+        select(
+            cart_rows.c.product_id,
+            cart_rows.c.quantity,
+            Product.name.label("product_name"),
+            Product.category_id,
+            Product.price.label("unit_price"),
+            (Product.price * cart_rows.c.quantity).label("line_total")
+        ).
+        join_from(cart_rows, Product, Product.id == cart_rows.c.product_id).
+        cte("items")
+    )
+    order_values = data_order.model_dump()
+    new_order = (
+        insert(Order).
+        from_select(
+            list(order_values),
+            select(*literal_values(Order, order_values)).
+            where(select(items.c.product_id).exists())
+        ).
+        returning(Order.id, Order.created_at).
+        cte("new_order")
+    )
+    order_details = (
+        insert(OrderDetail).
+        from_select(
+            [
+                "store_id",
+                "order_id",
+                "product_id",
+                "quantity",
+                "unit_price",
+                "line_total"
+            ],
+            select(
+                *literal_values(OrderDetail, {"store_id": store_id}),
+                new_order.c.id,
+                items.c.product_id,
+                items.c.quantity,
+                items.c.unit_price,
+                items.c.line_total
+            ).
+            join_from(new_order, items, true())
+        ).
+        returning(OrderDetail.id).
+        cte("order_details")
+    )
+    query = (
+        select(
+            new_order.c.id.label("order_id"),
+            items.c.product_id,
+            items.c.quantity,
+            items.c.product_name,
+            items.c.unit_price,
+            items.c.line_total,
+            func.sum(items.c.line_total).over().label("total_price")
+        ).
+        join_from(new_order, items, true()).
+        add_cte(
+            order_details,
+            upsert_product_sales(new_order, items, store_id),
+            upsert_customer_sales(new_order, items, store_id, tg_user_id)
         )
-        await bot.session.close()
-        return {
-            "status": "success",
-            "message": "Сообщение успешно отправлено",
-            "message_id": message.message_id}
+    )
+    if customer_info:
+        info_values = {
+            **customer_info.model_dump(),
+            "store_id": store_id,
+            "tg_user_id": tg_user_id
+        }
+        order_customer_info = (
+            insert(OrderCustomerInfo).
+            from_select(
+                [*info_values, "order_id"],
+                select(
+                    *literal_values(OrderCustomerInfo, info_values),
+                    new_order.c.id
+                )
+            ).
+            returning(OrderCustomerInfo.id).
+            cte("order_customer_info")
+        )
+        query = query.add_cte(order_customer_info)
+    result = await session.execute(query)
+    return result.all()
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Ошибка при отправке сообщения: {str(e)}")
 
+async def get_cart(session, schema, store_id, tg_user_id):
+    await use_tenant(session, schema)
+    query = (
+        select(
+            Product.id,
+            Product.name,
+            Product.image,
+            Cart.quantity,
+            (Cart.quantity * Product.price).label("unit_price"),
+            func.sum(Cart.quantity * Product.price).over().label("total_price")
+        )
+        .join(Cart, Cart.product_id == Product.id)
+        .where(
+            (Cart.tg_user_id == tg_user_id) & (Cart.store_id == store_id)
+        )
+        .group_by(Product.id, Cart.quantity, Product.name, Cart.tg_user_id)
+    )
+    result = await session.execute(query)
+    cart_items = []
+    total_price = 0
+    for row in result:
+        cart_item = CartItem(
+            id=row[0],
+            name=row[1],
+            image=row[2],
+            quantity=row[3],
+            unit_price=row[4]
+        )
+        cart_items.append(cart_item)
+        total_price = row[5]
+    return {
+        "cart_items": cart_items,
+        "total_price": total_price
+    }
 
-def create_keyboard(url: int):
-    button_store: InlineKeyboardButton = InlineKeyboardButton(
-        text='Оплата наличными',
-        callback_data='payment_cash')
-    button_store2: InlineKeyboardButton = InlineKeyboardButton(
-        text='Оплата картой',
-        url=url)
-    keyboard_store_builder: InlineKeyboardBuilder = InlineKeyboardBuilder()
 
-    keyboard_store_builder.row(button_store2, button_store, width=1)
-    keyboard_store = keyboard_store_builder.as_markup()
-    return keyboard_store
+async def sync_cart(session, data: CartSync, schema):
+    await use_tenant(session, schema)
+    where_cart = (
+        Cart.tg_user_id == data.tg_user_id,
+        Cart.store_id == data.store_id
+    )
+    quantities = {}
+    if data.items is not None:
+        for item in data.items:
+            quantities[item.product_id] = item.quantity
+        quantities = {
+            product_id: quantity
+            for product_id, quantity in quantities.items() if quantity > 0
+        }
+        await session.execute(
+            delete(Cart).
+            where(*where_cart, Cart.product_id.not_in(list(quantities)))
+        )
+    else:
+        for item in data.deltas:
+            quantities[item.product_id] = (
+                quantities.get(item.product_id, 0) + item.quantity)
+        quantities = {
+            product_id: quantity
+            for product_id, quantity in quantities.items() if quantity != 0
+        }
+    if not quantities:
+        return
+    # Сортировка по product_id задаёт одинаковый порядок блокировок строк
+    # для параллельных синхронизаций одной корзины.
+    stmt = pg_insert(Cart).values([
+        {
+            "store_id": data.store_id,
+            "tg_user_id": data.tg_user_id,
+            "product_id": product_id,
+            "quantity": quantities[product_id]
+        }
+        for product_id in sorted(quantities)
+    ])
+    if data.items is not None:
+        quantity = stmt.excluded.quantity
+    else:
+        quantity = Cart.quantity + stmt.excluded.quantity
+    await session.execute(
+        stmt.
+        on_conflict_do_update(
+            constraint="uq_cart_store_tg_user_product",
+            set_={"quantity": quantity}
+        )
+    )
+    if data.deltas is not None:
+        await session.execute(
+            delete(Cart).
+            where(
+                *where_cart,
+                Cart.product_id.in_(list(quantities)),
+                Cart.quantity <= 0
+            )
+        )
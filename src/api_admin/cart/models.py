@@ -1,4 +1,9 @@
-from sqlalchemy import BIGINT, ForeignKey, ForeignKeyConstraint
+from sqlalchemy import (
+    BIGINT,
+    ForeignKey,
+    ForeignKeyConstraint,
+    UniqueConstraint
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base, intpk
@@ -35,4 +40,8 @@ class Cart(Base):
             ['customers.store_id', 'customers.tg_user_id'],
             ondelete="CASCADE"
         ),
+        UniqueConstraint(
+            'store_id', 'tg_user_id', 'product_id',
+            name='uq_cart_store_tg_user_product'
+        ),
     )
@@ -0,0 +1,78 @@
+from aiogram.enums import ParseMode
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.api_admin.outbox.worker import outbox_handler
+from src.api_admin.scheduler.worker import job_handler, scheduler
+from src.bot.keyboards import (
+    create_order_acceptance_keyboard,
+    create_order_cancellation_keyboard
+)
+from src.api_admin.store.snapshot import get_store_config
+from src.bot.services import bot_registry
+
+
+ORDER_CHAT_ID = -1002144078281
+
+
+@outbox_handler("new_order")
+async def send_new_order_notifications(payload: dict, session: AsyncSession):
+    order_id = payload["order_id"]
+    order_sum = payload["order_sum"]
+    tg_user_id = payload["tg_user_id"]
+    store_config = await get_store_config(
+        session, payload["schema"], payload["store_id"])
+    bot = bot_registry.get(store_config.token_bot)
+    if payload.get("admin_message_id") is None:
+        new_order_keyboard = create_order_acceptance_keyboard(
+            order_id=order_id,
+            order_sum=order_sum,
+            user_id=tg_user_id,
+            order_status='Новый',
+            message_id=None
+        )
+        message = await bot.send_message(
+            ORDER_CHAT_ID,
+            payload["order_chat_text"],
+            reply_markup=new_order_keyboard,
+            parse_mode=ParseMode.MARKDOWN
+        )
+        payload["admin_message_id"] = message.message_id
+
+    customer_keyboard = create_order_cancellation_keyboard(
+        order_id=order_id,
+        order_sum=order_sum,
+        user_id=tg_user_id,
+        order_status='Отказ',
+        message_id=payload["admin_message_id"]
+    )
+    message = await bot.send_message(
+        tg_user_id,
+        payload["customer_text"],
+        reply_markup=customer_keyboard,
+        parse_mode=ParseMode.MARKDOWN
+    )
+
+    await scheduler.schedule(
+        session,
+        "remove_order_keyboard",
+        {
+            "schema": payload["schema"],
+            "store_id": payload["store_id"],
+            "chat_id": tg_user_id,
+            "message_id": message.message_id,
+        },
+        delay=settings.ORDER_KEYBOARD_TTL
+    )
+
+
+@job_handler("remove_order_keyboard")
+async def remove_order_keyboard(payload: dict, session: AsyncSession):
+    store_config = await get_store_config(
+        session, payload["schema"], payload["store_id"])
+    bot = bot_registry.get(store_config.token_bot)
+    await bot.edit_message_reply_markup(
+        chat_id=payload["chat_id"],
+        message_id=payload["message_id"],
+        reply_markup=None
+    )
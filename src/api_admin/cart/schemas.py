@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 from typing import Optional, List
 
 
@@ -22,6 +22,24 @@ class CartGet(BaseModel):
     store_id: int
 
 
+class CartSyncItem(BaseModel):
+    product_id: int
+    quantity: int
+
+
+class CartSync(BaseModel):
+    tg_user_id: int
+    store_id: int
+    items: Optional[List[CartSyncItem]] = None
+    deltas: Optional[List[CartSyncItem]] = None
+
+    @model_validator(mode="after")
+    def check_items_or_deltas(self):
+        if (self.items is None) == (self.deltas is None):
+            raise ValueError("Ожидается либо items, либо deltas")
+        return self
+
+
 class CartItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
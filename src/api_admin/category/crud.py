@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_async_session
+from src.cache import invalidate_catalog
+from src.tenancy import use_tenant
 from .models import Category
 from .schemas import CategoryCreate, CategoryUpdate
 from typing import List
@@ -15,12 +17,14 @@ async def crud_get_all_categories(
     store_id: int,
     session: AsyncSession = Depends(get_async_session)
 ):
+    # Витрина передаёт уже привязанную сессию, тогда use_tenant ничего
+    # не делает.
+    await use_tenant(session, schema)
     query = (
         select(Category)
         .where(Category.deleted_flag.is_(False))
         .where(Category.store_id == store_id)
         .order_by(Category.id.desc())
-        .execution_options(schema_translate_map={None: schema})
     )
     result = await session.execute(query)
     categories = result.scalars().all()
@@ -45,6 +49,7 @@ async def crud_create_new_category(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"status": 201, 'date': data}
 
 
@@ -66,6 +71,7 @@ async def crud_update_category(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"status": "success", 'date': data}
 
 
@@ -87,6 +93,7 @@ async def crud_change_delete_flag_category(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"message": "Статус для deleted_flag изменен"}
 
 
@@ -109,6 +116,7 @@ async def crud_update_category_field(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"message": f"Статус для {checkbox} изменен"}
 
 
@@ -125,6 +133,7 @@ async def crud_delete_category(
         )
         await session.execute(stmt)
         await session.commit()
+        await invalidate_catalog(schema)
         return {
             "status": "success",
             "message": f"Категория, c id {category_id}, успешно удалена."
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from src.database import (
     Base, intpk, str_64,
@@ -41,3 +41,11 @@ class Category(Base):
     def __init__(self, schema):
         super().__init__()
         self.__table_args__ = {'schema': schema}
+
+    __table_args__ = (
+        Index(
+            "ix_categories_store_id_id",
+            "store_id", text("id DESC"),
+            postgresql_where=text("deleted_flag IS false")
+        ),
+    )
@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import BIGINT, ForeignKey, text, UniqueConstraint
+from sqlalchemy import BIGINT, ForeignKey, Index, text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 
@@ -36,4 +36,5 @@ class Customer(Base):
 
     __table_args__ = (
         UniqueConstraint('store_id', 'tg_user_id', name='uq_store_tg_user'),
+        Index("ix_customers_store_id_id", "store_id", "id"),
     )
@@ -1,15 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from sqlalchemy import insert, select, delete, update
 
 from src.database import get_async_session
+from src.pagination import PageParams, paginate, stream_response
 
 
 from .models import Customer
 from .schemas import CustomerBase, CustomerCreate, CustomerUpdate
-from ..auth.routers import get_current_user_from_token
-from ..user import User
+from ..auth.routers import get_tenant_session
 
 router = APIRouter(
     prefix="/api/v1/customer",
@@ -19,17 +19,18 @@ router = APIRouter(
 @router.get("/")
 async def get_all_customer(
     store_id: int,
-    current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_tenant_session)
 ) -> List[CustomerBase]:
     query = (
         select(Customer).
-        where(Customer.store_id == store_id).
-        order_by(Customer.id.desc()).
-        execution_options(schema_translate_map={None: str(current_user.id)})
+        where(Customer.store_id == store_id)
     )
-    result = await session.execute(query)
-    return result.scalars().all()
+    if page.stream:
+        return stream_response(
+            session, query, Customer.id, page, CustomerBase, "customers")
+    return await paginate(session, query, Customer.id, page, response)
 
 
 @router.post("/")
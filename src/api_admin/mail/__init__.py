@@ -1,7 +1,8 @@
-from .models import Mail, MailImage
+from .models import Mail, MailImage, Broadcast
 
 
 all = [
     Mail,
     MailImage,
+    Broadcast,
 ]
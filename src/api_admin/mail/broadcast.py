@@ -0,0 +1,308 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Sequence
+
+from aiogram import Bot
+from aiogram.enums import ParseMode
+from aiogram.types import Message
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter
+)
+from sqlalchemy import Row, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import func
+
+from src.bot.services import bot_registry
+from src.config import settings
+from src.api_admin.scheduler.worker import job_handler, scheduler
+from ..customer.models import Customer
+from .models import Broadcast, MailImage
+from .schemas import TextMail
+
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты отправки для одного бота. После RetryAfter
+    приостанавливает все отправки этого бота на указанное время.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        self._next_at = max(self._next_at, time.monotonic() + seconds)
+
+
+rate_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(token: str) -> RateLimiter:
+    limiter = rate_limiters.get(token)
+    if limiter is None:
+        limiter = RateLimiter(settings.BROADCAST_RATE_LIMIT)
+        rate_limiters[token] = limiter
+    return limiter
+
+
+async def create_broadcast(
+    session: AsyncSession,
+    user_id: int,
+    store_id: int,
+    data: TextMail
+) -> int:
+    result = await session.execute(
+        insert(Broadcast).
+        values(
+            user_id=user_id,
+            store_id=store_id,
+            mail_text=data.mail_text,
+            photo_url=data.photo_url
+        ).
+        returning(Broadcast.id)
+    )
+    broadcast_id = result.scalar()
+    await scheduler.schedule(
+        session, "mail_broadcast", {"broadcast_id": broadcast_id})
+    return broadcast_id
+
+
+async def send_broadcast_message(
+    bot: Bot,
+    limiter: RateLimiter,
+    chat_id: int,
+    text: str,
+    photo: Optional[str] = None
+) -> Optional[Message]:
+    for _ in range(settings.BROADCAST_MAX_RETRIES):
+        await limiter.acquire()
+        try:
+            if photo:
+                return await bot.send_photo(
+                    chat_id=chat_id,
+                    photo=photo,
+                    caption=text,
+                    parse_mode=ParseMode.MARKDOWN_V2
+                )
+            return await bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
+        except TelegramRetryAfter as e:
+            limiter.pause(e.retry_after)
+        except (TelegramBadRequest, TelegramForbiddenError) as e:
+            logger.info(f"Broadcast message to {chat_id} rejected: {e}")
+            return None
+        except TelegramNetworkError:
+            await asyncio.sleep(1)
+    return None
+
+
+async def get_photo_file_id(
+    session: AsyncSession,
+    broadcast: Broadcast,
+    bot_id: int
+) -> Optional[str]:
+    query = (
+        select(MailImage.tg_file_id).
+        where(
+            MailImage.image == broadcast.photo_url,
+            MailImage.tg_bot_id == bot_id,
+            MailImage.tg_file_id.is_not(None)
+        ).
+        limit(1).
+        execution_options(
+            schema_translate_map={None: str(broadcast.user_id)})
+    )
+    result = await session.execute(query)
+    return result.scalar()
+
+
+async def save_photo_file_id(
+    session: AsyncSession,
+    broadcast: Broadcast,
+    bot_id: int,
+    file_id: str
+):
+    """
+    file_id привязан к боту, поэтому сохраняется вместе с его id.
+    Следующие рассылки с той же картинкой сразу отправляют file_id.
+    """
+    schema = str(broadcast.user_id)
+    await session.execute(
+        update(Broadcast).
+        where(Broadcast.id == broadcast.id).
+        values(photo_file_id=file_id)
+    )
+    result = await session.execute(
+        update(MailImage).
+        where(MailImage.image == broadcast.photo_url).
+        values(tg_file_id=file_id, tg_bot_id=bot_id).
+        execution_options(schema_translate_map={None: schema})
+    )
+    if result.rowcount == 0:
+        await session.execute(
+            insert(MailImage).
+            values(
+                image=broadcast.photo_url,
+                tg_file_id=file_id,
+                tg_bot_id=bot_id,
+                created_by=broadcast.user_id
+            ).
+            execution_options(schema_translate_map={None: schema})
+        )
+    await session.commit()
+    set_committed_value(broadcast, "photo_file_id", file_id)
+
+
+async def get_recipients_page(
+    session: AsyncSession,
+    broadcast: Broadcast
+) -> Sequence[Row]:
+    query = (
+        select(Customer.id, Customer.tg_user_id).
+        where(
+            Customer.store_id == broadcast.store_id,
+            Customer.id > broadcast.last_customer_id
+        ).
+        order_by(Customer.id).
+        limit(settings.BROADCAST_PAGE_SIZE).
+        execution_options(
+            schema_translate_map={None: str(broadcast.user_id)})
+    )
+    result = await session.execute(query)
+    return result.all()
+
+
+async def count_recipients(session: AsyncSession, broadcast: Broadcast):
+    query = (
+        select(func.count(Customer.id)).
+        where(Customer.store_id == broadcast.store_id).
+        execution_options(
+            schema_translate_map={None: str(broadcast.user_id)})
+    )
+    result = await session.execute(query)
+    return result.scalar()
+
+
+async def fail_broadcast(payload: dict, error: str, session: AsyncSession):
+    await session.execute(
+        update(Broadcast).
+        where(
+            Broadcast.id == payload["broadcast_id"],
+            Broadcast.status.in_(("pending", "running"))
+        ).
+        values(
+            status="failed",
+            error=error,
+            finished_at=func.timezone('utc', func.now())
+        )
+    )
+
+
+@job_handler("mail_broadcast", on_failure=fail_broadcast)
+async def run_broadcast(payload: dict, session: AsyncSession):
+    """
+    Отправляет рассылку страницами получателей, отсортированных по id.
+    Прогресс сохраняется после каждой страницы. Запуск ограничен по
+    времени и, если получатели остались, планирует продолжение отдельной
+    задачей, чтобы не занимать планировщик надолго. Если повторы
+    закончились, fail_broadcast помечает рассылку как failed.
+    """
+    broadcast_id = payload["broadcast_id"]
+    broadcast = await session.get(Broadcast, broadcast_id)
+    if broadcast is None or broadcast.status in ("done", "failed"):
+        return
+    if broadcast.status == "pending":
+        await session.execute(
+            update(Broadcast).
+            where(Broadcast.id == broadcast_id).
+            values(
+                status="running",
+                total=await count_recipients(session, broadcast),
+                started_at=func.timezone('utc', func.now())
+            )
+        )
+        await session.commit()
+
+    bot = bot_registry.get(settings.BOT_TOKEN)
+    limiter = get_rate_limiter(settings.BOT_TOKEN)
+    semaphore = asyncio.Semaphore(settings.BROADCAST_CONCURRENCY)
+
+    if broadcast.photo_url and not broadcast.photo_file_id:
+        file_id = await get_photo_file_id(session, broadcast, bot.id)
+        if file_id:
+            await save_photo_file_id(session, broadcast, bot.id, file_id)
+
+    async def send(chat_id: int) -> Optional[Message]:
+        async with semaphore:
+            return await send_broadcast_message(
+                bot,
+                limiter,
+                chat_id,
+                broadcast.mail_text,
+                broadcast.photo_file_id or broadcast.photo_url
+            )
+
+    deadline = time.monotonic() + settings.BROADCAST_JOB_TIME_BUDGET
+    while time.monotonic() < deadline:
+        recipients = await get_recipients_page(session, broadcast)
+        if not recipients:
+            await session.execute(
+                update(Broadcast).
+                where(Broadcast.id == broadcast_id).
+                values(
+                    status="done",
+                    finished_at=func.timezone('utc', func.now())
+                )
+            )
+            await session.commit()
+            return
+        last_id = recipients[-1].id
+        results = []
+        if broadcast.photo_url and not broadcast.photo_file_id:
+            # Пока file_id неизвестен, отправляем по одному: Telegram
+            # скачивает картинку по ссылке только до первой успешной
+            # отправки, дальше вся рассылка идёт по file_id.
+            while recipients and not broadcast.photo_file_id:
+                message = await send(recipients[0].tg_user_id)
+                results.append(message)
+                recipients = recipients[1:]
+                if message is not None and message.photo:
+                    await save_photo_file_id(
+                        session, broadcast, bot.id, message.photo[-1].file_id)
+        results += await asyncio.gather(
+            *(send(recipient.tg_user_id) for recipient in recipients))
+        sent = sum(message is not None for message in results)
+        await session.execute(
+            update(Broadcast).
+            where(Broadcast.id == broadcast_id).
+            values(
+                sent=Broadcast.sent + sent,
+                failed=Broadcast.failed + len(results) - sent,
+                last_customer_id=last_id
+            )
+        )
+        await session.commit()
+        await session.refresh(broadcast)
+
+    await scheduler.schedule(
+        session, "mail_broadcast", {"broadcast_id": broadcast_id})
@@ -1,9 +1,8 @@
-import io
 from datetime import datetime
-from PIL import Image
 from fastapi import APIRouter, Depends, HTTPException, UploadFile
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from aiogram import Bot, Dispatcher, exceptions as tg_exceptions
+from aiogram import Dispatcher, exceptions as tg_exceptions
 from aiogram.types.web_app_info import WebAppInfo
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.types import InlineKeyboardButton
@@ -11,13 +10,15 @@ from aiogram.enums import ParseMode
 
 from src.database import get_async_session
 from src.config import settings
-from .schemas import TextMail
+from src.images import process_and_upload_image
+from src.bot.services import bot_registry
+from .broadcast import create_broadcast
+from .models import Broadcast, MailImage
+from .schemas import BroadcastStatus, TextMail
 from ..user import User
-from ..auth.routers import get_current_user_from_token
-from ..customer.routers import get_all_customer
+from ..auth.routers import get_current_user_from_token, get_tenant_session
 from ..user.routers import get_one_user
 from ..store.routers import get_one_store
-from ..product.controller import s3
 
 
 web_app = WebAppInfo(url='https://store.envelope-app.ru/schema=1/store_id=1/')
@@ -39,11 +40,10 @@ router = APIRouter(
     tags=["Mail (admin)"])
 
 
-bot = Bot(token=settings.BOT_TOKEN)
 dp: Dispatcher = Dispatcher()
 
 
-@router.post("/send_message/")
+@router.post("/send_message/", status_code=202)
 async def send_message(
     data: TextMail,
     store_id: int,
@@ -51,35 +51,38 @@ async def send_message(
     session: AsyncSession = Depends(get_async_session)
 ):
     try:
-        customers = await get_all_customer(
+        broadcast_id = await create_broadcast(
+            session=session,
+            user_id=current_user.id,
             store_id=store_id,
-            current_user=current_user,
-            session=session
+            data=data
         )
-        for customer in customers:
-            tg_user_id = customer.tg_user_id
-            try:
-                if data.photo_url:
-                    await bot.send_photo(
-                        chat_id=tg_user_id,
-                        photo=data.photo_url,
-                        caption=f"{data.mail_text}",
-                        parse_mode=ParseMode.MARKDOWN_V2
-                    )
-                else:
-                    await bot.send_message(
-                        chat_id=tg_user_id,
-                        text=f"{data.mail_text}",
-                        parse_mode=ParseMode.MARKDOWN_V2
-                    )
-            except tg_exceptions.TelegramBadRequest as e:
-                print(
-                    "Ошибка при отправке сообщения пользователю "
-                    f"{tg_user_id}: {e}")
-        return {"status": "success", "message": "Сообщение успешно отправлено"}
+        await session.commit()
+        return {"status": "accepted", "broadcast_id": broadcast_id}
     except Exception as e:
+        await session.rollback()
         raise HTTPException(
-            status_code=500, detail=f"Ошибка при отправке сообщения: {str(e)}")
+            status_code=500, detail=f"Ошибка при создании рассылки: {str(e)}")
+
+
+@router.get("/broadcast/{broadcast_id}/", response_model=BroadcastStatus)
+async def get_broadcast_status(
+    broadcast_id: int,
+    current_user: User = Depends(get_current_user_from_token),
+    session: AsyncSession = Depends(get_async_session)
+):
+    query = (
+        select(Broadcast).
+        where(
+            Broadcast.id == broadcast_id,
+            Broadcast.user_id == current_user.id
+        )
+    )
+    result = await session.execute(query)
+    broadcast = result.scalar_one_or_none()
+    if broadcast is None:
+        raise HTTPException(status_code=404, detail="Рассылка не найдена")
+    return broadcast
 
 
 @router.post("/send_message_self/")
@@ -88,6 +91,7 @@ async def send_message_self(
     current_user: User = Depends(get_current_user_from_token),
     session: AsyncSession = Depends(get_async_session)
 ):
+    bot = bot_registry.get(settings.BOT_TOKEN)
     try:
         tg_id = await get_one_user(current_user=current_user, session=session)
         if data.photo_url:
@@ -117,14 +121,16 @@ async def send_message_group(
     data: TextMail,
     store_id: int,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
+    bot = bot_registry.get(settings.BOT_TOKEN)
     try:
-        tg_group = await get_one_store(
+        store = await get_one_store(
             store_id=store_id,
             current_user=current_user,
             session=session
         )
+        tg_group = store.service_text_and_chats
         if data.photo_url:
             await bot.send_photo(
                 chat_id=tg_group.tg_id_group,
@@ -151,18 +157,10 @@ async def send_message_group(
 async def process_and_upload_photo(
     file: UploadFile,
     store_id: int,
-    current_user: User = Depends(get_current_user_from_token)
+    current_user: User = Depends(get_current_user_from_token),
+    session: AsyncSession = Depends(get_async_session)
 ):
     try:
-        image = Image.open(io.BytesIO(await file.read()))
-
-        image.thumbnail((900, 900))
-
-        with io.BytesIO() as output_buffer:
-            image.save(output_buffer, format="WebP")
-            output_buffer.seek(0)
-            webp_image = Image.open(output_buffer)
-
         current_datetime = datetime.now()
         current_date_str = current_datetime.strftime("%Y-%m-%d_%H-%M-%S")
 
@@ -170,15 +168,15 @@ async def process_and_upload_photo(
             f"{current_user.id}/{store_id}/"
             f"mail/{current_date_str}_{file.filename}"
         )
-        with io.BytesIO() as webp_output_buffer:
-            webp_image.save(webp_output_buffer, format="WebP")
-            webp_output_buffer.seek(0)
-            s3.upload_fileobj(webp_output_buffer,
-                              settings.BUCKET_NAME, object_key)
-
-        object_url = (
-            f'{settings.ENDPOINT_URL}/{settings.BUCKET_NAME}/{object_key}'
+        object_url = await process_and_upload_image(
+            await file.read(), object_key)
+        await session.execute(
+            insert(MailImage).
+            values(image=object_url, created_by=current_user.id).
+            execution_options(
+                schema_translate_map={None: str(current_user.id)})
         )
+        await session.commit()
 
         return object_url
     except Exception as e:
@@ -1,9 +1,10 @@
+import datetime
 from typing import List, TYPE_CHECKING
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy import ForeignKey
+from sqlalchemy import BIGINT, ForeignKey, text
 from src.database import (
     Base, intpk, created_at,
-    str_256, str_4048, deleted_flag,
+    str_64, str_256, str_4048, deleted_flag,
     deleted_at,
 )
 
@@ -46,6 +47,8 @@ class MailImage(Base):
 
     id: Mapped[intpk]
     image: Mapped[str | None]
+    tg_file_id: Mapped[str | None]
+    tg_bot_id: Mapped[int | None] = mapped_column(BIGINT)
     created_by: Mapped[int] = mapped_column(
         ForeignKey("public.users.id", ondelete="CASCADE"))
     created_at: Mapped[created_at]
@@ -59,3 +62,25 @@ class MailImage(Base):
     def __init__(self, schema):
         super().__init__()
         self.__table_args__ = {'schema': schema}
+
+
+class Broadcast(Base):
+    __tablename__ = 'broadcasts'
+    __table_args__ = {'schema': 'public'}
+
+    id: Mapped[intpk]
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("public.users.id", ondelete="CASCADE"))
+    store_id: Mapped[int]
+    mail_text: Mapped[str_4048]
+    photo_url: Mapped[str | None]
+    photo_file_id: Mapped[str | None]
+    status: Mapped[str_64] = mapped_column(server_default=text("'pending'"))
+    total: Mapped[int] = mapped_column(server_default=text("0"))
+    sent: Mapped[int] = mapped_column(server_default=text("0"))
+    failed: Mapped[int] = mapped_column(server_default=text("0"))
+    last_customer_id: Mapped[int] = mapped_column(server_default=text("0"))
+    error: Mapped[str | None]
+    created_at: Mapped[created_at]
+    started_at: Mapped[datetime.datetime | None]
+    finished_at: Mapped[datetime.datetime | None]
@@ -1,3 +1,4 @@
+import datetime
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
@@ -9,6 +10,21 @@ class TextMail(BaseModel):
     photo_url: Optional[str] = None
 
 
+class BroadcastStatus(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    store_id: int
+    status: str
+    total: int
+    sent: int
+    failed: int
+    error: Optional[str] = None
+    created_at: datetime.datetime
+    started_at: Optional[datetime.datetime] = None
+    finished_at: Optional[datetime.datetime] = None
+
+
 class Test(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
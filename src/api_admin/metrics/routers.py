@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+
+from src.cache import cache
+from src.database import engine
+from src.pool import get_pool_status
+from src.tenancy import statement_stats
+from ..auth.routers import get_current_user_from_token
+
+
+router = APIRouter(
+    prefix="/api/v1/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(get_current_user_from_token)])
+
+
+@router.get("/pool/")
+async def get_pool_metrics():
+    return get_pool_status(engine.pool)
+
+
+@router.get("/cache/")
+async def get_cache_metrics():
+    return cache.stats()
+
+
+@router.get("/statements/")
+async def get_statement_metrics():
+    return statement_stats.snapshot()
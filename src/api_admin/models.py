@@ -6,10 +6,18 @@ from .product import Unit, Product
 from .employee import Employee
 from .auth import Token
 from .cart import Cart
-from .order import Order, OrderDetail, OrderCustomerInfo
-from .mail import Mail, MailImage
+from .order import (
+    Order,
+    OrderDetail,
+    OrderCustomerInfo,
+    DailyProductSales,
+    DailyCustomerSales
+)
+from .mail import Mail, MailImage, Broadcast
 from .customer import Customer
 from .payment import PaymentYookassa
+from .outbox import OutboxMessage
+from .scheduler import ScheduledJob
 from .store import (
     Store,
     BotToken,
@@ -43,9 +51,12 @@ all = (
     'Order',
     'OrderDetail',
     'OrderCustomerInfo',
+    'DailyProductSales',
+    'DailyCustomerSales',
     'Customer',
     'Mail',
     'MailImage',
+    'Broadcast',
     'Store',
     'BotToken',
     'OrderType',
@@ -63,6 +74,8 @@ all = (
     'DeliveryDistrict',
     'TypeDelivery',
     'PaymentYookassa',
+    'OutboxMessage',
+    'ScheduledJob',
 )
 
 model_for_public = [
@@ -75,6 +88,9 @@ model_for_public = [
     DayOfWeek,
     Employee,
     TypeDelivery,
+    OutboxMessage,
+    ScheduledJob,
+    Broadcast,
 
 ]
 
@@ -91,6 +107,8 @@ model_for_new_schema = [
     Order.__table__,
     OrderDetail.__table__,
     OrderCustomerInfo.__table__,
+    DailyProductSales.__table__,
+    DailyCustomerSales.__table__,
     StoreOrderTypeAssociation.__table__,
     StoreInfo.__table__,
     StoreSubscription.__table__,
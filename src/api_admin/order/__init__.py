@@ -1,8 +1,17 @@
-from .models import Order, OrderDetail, OrderCustomerInfo, OrderStatus
+from .models import (
+    Order,
+    OrderDetail,
+    OrderCustomerInfo,
+    OrderStatus,
+    DailyProductSales,
+    DailyCustomerSales
+)
 
 all = [
     Order,
     OrderDetail,
     OrderCustomerInfo,
     OrderStatus,
+    DailyProductSales,
+    DailyCustomerSales,
 ]
@@ -1,4 +1,5 @@
-from sqlalchemy import BIGINT, ForeignKey, ForeignKeyConstraint, text
+import datetime
+from sqlalchemy import BIGINT, ForeignKey, ForeignKeyConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import (
@@ -43,6 +44,7 @@ class Order(Base):
             ['store_id', 'tg_user_id'],
             ['customers.store_id', 'customers.tg_user_id'],
             ondelete="CASCADE"),
+        Index("ix_orders_store_id_id", "store_id", "id"),
     )
 
 
@@ -58,7 +60,10 @@ class OrderDetail(Base):
     product_id: Mapped[int] = mapped_column(
         ForeignKey("products.id", ondelete="CASCADE"))
     quantity: Mapped[int]
+    # unit_price - цена за единицу, line_total - выручка по позиции
+    # (unit_price * quantity). Выручка везде считается по line_total.
     unit_price: Mapped[float]
+    line_total: Mapped[float]
     created_at: Mapped[created_at]
 
     store: Mapped['Store'] = relationship(back_populates="order_details")
@@ -69,6 +74,15 @@ class OrderDetail(Base):
         super().__init__()
         self.__table_args__ = {'schema': schema}
 
+    __table_args__ = (
+        Index("ix_order_details_store_id_id", "store_id", "id"),
+        Index(
+            "ix_order_details_store_id_created_at",
+            "store_id", "created_at",
+            postgresql_include=["product_id", "quantity", "line_total"]
+        ),
+    )
+
 
 class OrderStatus(Base):
     __tablename__ = "order_status"
@@ -111,3 +125,54 @@ class OrderCustomerInfo(Base):
             ['customers.store_id', 'customers.tg_user_id'],
             ondelete="CASCADE"),
     )
+
+
+class DailyProductSales(Base):
+    """
+    Продажи товара магазина за день. Строки обновляются при оформлении
+    заказа, отчёты читают их вместо всей истории order_details.
+    """
+    __tablename__ = "daily_product_sales"
+    __table_args__ = {'schema': None}
+
+    store_id: Mapped[int] = mapped_column(
+        ForeignKey("stores.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[datetime.date] = mapped_column(primary_key=True)
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    category_id: Mapped[int | None] = mapped_column(
+        ForeignKey("categories.id", ondelete="SET NULL"))
+    quantity: Mapped[int]
+    total_sales: Mapped[float]
+
+    __table_args__ = (
+        Index(
+            "ix_daily_product_sales_store_id_day",
+            "store_id", "day",
+            postgresql_include=["product_id", "category_id", "total_sales"]
+        ),
+    )
+
+
+class DailyCustomerSales(Base):
+    __tablename__ = "daily_customer_sales"
+    __table_args__ = {'schema': None}
+
+    store_id: Mapped[int] = mapped_column(primary_key=True)
+    day: Mapped[datetime.date] = mapped_column(primary_key=True)
+    tg_user_id: Mapped[int] = mapped_column(BIGINT, primary_key=True)
+    orders_count: Mapped[int]
+    total_sales: Mapped[float]
+    last_order_at: Mapped[datetime.datetime]
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ['store_id', 'tg_user_id'],
+            ['customers.store_id', 'customers.tg_user_id'],
+            ondelete="CASCADE"),
+        Index(
+            "ix_daily_customer_sales_store_id_day",
+            "store_id", "day",
+            postgresql_include=["tg_user_id", "total_sales", "last_order_at"]
+        ),
+    )
@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import CTE, Date, cast, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import func
+
+from .models import DailyCustomerSales, DailyProductSales
+
+
+def upsert_product_sales(new_order: CTE, items: CTE, store_id: int) -> CTE:
+    """
+    CTE, прибавляющий позиции нового заказа к дневным продажам товаров.
+    items - позиции заказа с product_id, category_id, quantity и
+    line_total. Без JOIN в SELECT: ON после JOIN перед ON CONFLICT
+    читался бы неоднозначно.
+    """
+    stmt = pg_insert(DailyProductSales).from_select(
+        [
+            "store_id",
+            "day",
+            "product_id",
+            "category_id",
+            "quantity",
+            "total_sales"
+        ],
+        select(
+            literal(store_id, DailyProductSales.store_id.type),
+            cast(select(new_order.c.created_at).scalar_subquery(), Date),
+            items.c.product_id,
+            items.c.category_id,
+            items.c.quantity,
+            items.c.line_total
+        )
+    )
+    return (
+        stmt.
+        on_conflict_do_update(
+            index_elements=["store_id", "day", "product_id"],
+            set_={
+                "quantity":
+                    DailyProductSales.quantity + stmt.excluded.quantity,
+                "total_sales":
+                    DailyProductSales.total_sales + stmt.excluded.total_sales
+            }
+        ).
+        returning(DailyProductSales.product_id).
+        cte("product_sales")
+    )
+
+
+def upsert_customer_sales(
+    new_order: CTE,
+    items: CTE,
+    store_id: int,
+    tg_user_id: int
+) -> CTE:
+    stmt = pg_insert(DailyCustomerSales).from_select(
+        [
+            "store_id",
+            "day",
+            "tg_user_id",
+            "orders_count",
+            "total_sales",
+            "last_order_at"
+        ],
+        select(
+            literal(store_id, DailyCustomerSales.store_id.type),
+            cast(new_order.c.created_at, Date),
+            literal(tg_user_id, DailyCustomerSales.tg_user_id.type),
+            literal(1),
+            select(func.sum(items.c.line_total)).scalar_subquery(),
+            new_order.c.created_at
+        )
+    )
+    return (
+        stmt.
+        on_conflict_do_update(
+            index_elements=["store_id", "day", "tg_user_id"],
+            set_={
+                "orders_count": DailyCustomerSales.orders_count + 1,
+                "total_sales":
+                    DailyCustomerSales.total_sales +
+                    stmt.excluded.total_sales,
+                "last_order_at": func.greatest(
+                    DailyCustomerSales.last_order_at,
+                    stmt.excluded.last_order_at
+                )
+            }
+        ).
+        returning(DailyCustomerSales.tg_user_id).
+        cte("customer_sales")
+    )
+
+
+def period_filter(
+    day_column,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+) -> list:
+    # Сводки хранятся по дням, поэтому границы периода берутся с
+    # точностью до дня включительно.
+    conditions = []
+    if start_date:
+        conditions.append(day_column >= start_date.date())
+    if end_date:
+        conditions.append(day_column <= end_date.date())
+    return conditions
@@ -1,11 +1,16 @@
-from sqlalchemy import and_
 from datetime import datetime
 from fastapi import Query
-from fastapi import Depends, APIRouter
+from fastapi import Depends, APIRouter, Response
 from sqlalchemy import func, desc
 from sqlalchemy.future import select
 from typing import List, Optional
-from .models import Order, OrderDetail
+from .models import (
+    Order,
+    OrderDetail,
+    DailyCustomerSales,
+    DailyProductSales
+)
+from .rollups import period_filter
 from ..models import Category, Product, Customer
 from ..customer.schemas import ReportCustomer
 from .schemas import (
@@ -14,9 +19,8 @@ from .schemas import (
     ReportMain
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.database import get_async_session
-from ..user import User
-from ..auth.routers import get_current_user_from_token
+from src.pagination import PageParams, paginate, stream_response
+from ..auth.routers import get_tenant_session
 
 
 router = APIRouter(
@@ -27,33 +31,36 @@ router = APIRouter(
 @router.get("/order/")
 async def get_all_orders(
     store_id: int,
-    current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_tenant_session)
 ) -> List[OrderBase]:
     query = (
         select(Order).
-        where(Order.store_id == store_id).
-        order_by(Order.id.desc()).
-        execution_options(schema_translate_map={None: str(current_user.id)})
+        where(Order.store_id == store_id)
     )
-    result = await session.execute(query)
-    return result.scalars().all()
+    if page.stream:
+        return stream_response(
+            session, query, Order.id, page, OrderBase, "orders")
+    return await paginate(session, query, Order.id, page, response)
 
 
 @router.get("/order_detail/")
 async def get_all_order_details(
     store_id: int,
-    current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    response: Response,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(get_tenant_session)
 ) -> List[OrderDetailBase]:
     query = (
         select(OrderDetail).
-        where(OrderDetail.store_id == store_id).
-        order_by(OrderDetail.id.desc()).
-        execution_options(schema_translate_map={None: str(current_user.id)})
+        where(OrderDetail.store_id == store_id)
     )
-    result = await session.execute(query)
-    return result.scalars().all()
+    if page.stream:
+        return stream_response(
+            session, query, OrderDetail.id, page, OrderDetailBase,
+            "order_details")
+    return await paginate(session, query, OrderDetail.id, page, response)
 
 
 # @router.get("/customer/")
@@ -98,27 +105,20 @@ async def get_category_data(
     store_id: int,
     start_date: datetime = Query(None),
     end_date: datetime = Query(None),
-    current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
-    # Создайте условие для фильтрации по дате
-    date_filter = and_(
-        OrderDetail.created_at >= start_date if start_date else True,
-        OrderDetail.created_at <= end_date if end_date else True
-    )
-
     query = (
         select(
             Category.name.label("category_name"),
-            func.sum(OrderDetail.unit_price).label("total_sales"))
-        .join(Product, Product.category_id == Category.id)
-        .join(OrderDetail, OrderDetail.product_id == Product.id)
-        .where(and_(OrderDetail.store_id == store_id, date_filter))
-        .group_by(Category.name)
-    ).order_by(desc("total_sales")).execution_options(
-        schema_translate_map={None: str(current_user.id)}
+            func.sum(DailyProductSales.total_sales).label("total_sales")).
+        join(Category, Category.id == DailyProductSales.category_id).
+        where(
+            DailyProductSales.store_id == store_id,
+            *period_filter(DailyProductSales.day, start_date, end_date)
+        ).
+        group_by(Category.name).
+        order_by(desc("total_sales"))
     )
-
     result = await session.execute(query)
     data = result.all()
     return data
@@ -127,9 +127,23 @@ async def get_category_data(
 @router.get("/customer/", response_model=List[ReportCustomer])
 async def get_customer_data(
     store_id: int,
-    current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    start_date: datetime = Query(None),
+    end_date: datetime = Query(None),
+    session: AsyncSession = Depends(get_tenant_session)
 ):
+    sales = (
+        select(
+            DailyCustomerSales.tg_user_id,
+            func.sum(DailyCustomerSales.total_sales).label("total_sales"),
+            func.max(DailyCustomerSales.last_order_at).label("last_order_at")
+        ).
+        where(
+            DailyCustomerSales.store_id == store_id,
+            *period_filter(DailyCustomerSales.day, start_date, end_date)
+        ).
+        group_by(DailyCustomerSales.tg_user_id).
+        subquery()
+    )
     query = (
         select(
             Customer.id,
@@ -138,25 +152,15 @@ async def get_customer_data(
             Customer.first_name,
             Customer.last_name,
             Customer.is_premium,
-            func.coalesce(
-                func.sum(
-                    OrderDetail.quantity *
-                    OrderDetail.unit_price
-                ), 0
-            ).label("total_sales"),
-            func.coalesce(func.to_char(func.max(
-                Order.created_at
-            ), 'DD.MM.YYYY'), '-').label("last_order_date")
-        )
-        .outerjoin(Order)
-        .outerjoin(OrderDetail, OrderDetail.order_id == Order.id)
-        .select_from(Customer)
-        .group_by(Customer.id)
-        .order_by(desc(Customer.id))
-        .where(Customer.store_id == store_id)
-        .execution_options(schema_translate_map={None: str(current_user.id)})
+            func.coalesce(sales.c.total_sales, 0).label("total_sales"),
+            func.coalesce(func.to_char(
+                sales.c.last_order_at, 'DD.MM.YYYY'
+            ), '-').label("last_order_date")
+        ).
+        outerjoin(sales, sales.c.tg_user_id == Customer.tg_user_id).
+        where(Customer.store_id == store_id).
+        order_by(desc(Customer.id))
     )
-
     result = await session.execute(query)
     data = result.all()
     return data
@@ -168,20 +172,23 @@ async def get_customer_data(
 )
 async def get_product_data(
     store_id: int,
-    current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    start_date: datetime = Query(None),
+    end_date: datetime = Query(None),
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     query = (
         select(
             Product.name.label("product_name"),
             Category.name.label("category_name"),
-            func.sum(OrderDetail.unit_price).label("total_sales")).
-        join(Product, Product.category_id == Category.id).
-        join(OrderDetail, OrderDetail.product_id == Product.id).
-        where(OrderDetail.store_id == store_id).
+            func.sum(DailyProductSales.total_sales).label("total_sales")).
+        join(Product, Product.id == DailyProductSales.product_id).
+        join(Category, Category.id == DailyProductSales.category_id).
+        where(
+            DailyProductSales.store_id == store_id,
+            *period_filter(DailyProductSales.day, start_date, end_date)
+        ).
         group_by(Product.name, Category.name).
-        order_by(desc("total_sales")).
-        execution_options(schema_translate_map={None: str(current_user.id)})
+        order_by(desc("total_sales"))
     )
     result = await session.execute(query)
     data = result.all()
@@ -191,15 +198,18 @@ async def get_product_data(
 @router.get("/total_report/", response_model=Optional[ReportMain])
 async def get_main_data(
     store_id: int,
-    current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    start_date: datetime = Query(None),
+    end_date: datetime = Query(None),
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     query = (
         select(
-            func.sum(OrderDetail.unit_price).label("total_sales"))
-        .where(OrderDetail.store_id == store_id)
-        .execution_options(
-            schema_translate_map={None: str(current_user.id)}))
+            func.sum(DailyProductSales.total_sales).label("total_sales")).
+        where(
+            DailyProductSales.store_id == store_id,
+            *period_filter(DailyProductSales.day, start_date, end_date)
+        )
+    )
     result = await session.execute(query)
     total_sales = result.scalar()
     report_data = {"total_sales": total_sales}
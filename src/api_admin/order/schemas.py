@@ -27,6 +27,7 @@ class OrderDetailBase(BaseModel):
     product_id: int
     quantity: int
     unit_price: float
+    line_total: float
 
 
 class OrderDetailCreate(OrderDetailBase):
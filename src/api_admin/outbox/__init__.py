@@ -0,0 +1,5 @@
+from .models import OutboxMessage
+
+all = [
+    OutboxMessage,
+]
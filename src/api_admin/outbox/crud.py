@@ -0,0 +1,110 @@
+import datetime
+from typing import Any, List
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from .models import OutboxMessage
+
+
+def utc_now():
+    return func.timezone('utc', func.now())
+
+
+async def enqueue_outbox_message(
+    session: AsyncSession,
+    event_type: str,
+    payload: dict[str, Any]
+):
+    """
+    Добавляет сообщение в outbox в текущей транзакции, без commit.
+    """
+    await session.execute(
+        insert(OutboxMessage).
+        values(event_type=event_type, payload=payload)
+    )
+
+
+async def claim_outbox_messages(
+    session: AsyncSession,
+    limit: int,
+    lease: float
+) -> List[OutboxMessage]:
+    # Сообщение откладывается на время аренды: если воркер упадёт,
+    # не отметив результат, сообщение снова станет доступным.
+    ids = (
+        select(OutboxMessage.id).
+        where(
+            OutboxMessage.status == 'pending',
+            OutboxMessage.available_at <= utc_now()
+        ).
+        order_by(OutboxMessage.available_at, OutboxMessage.id).
+        limit(limit).
+        with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(OutboxMessage).
+        where(OutboxMessage.id.in_(ids)).
+        values(
+            attempts=OutboxMessage.attempts + 1,
+            available_at=utc_now() + datetime.timedelta(seconds=lease)
+        ).
+        returning(OutboxMessage).
+        execution_options(synchronize_session=False)
+    )
+    result = await session.execute(stmt)
+    messages = result.scalars().all()
+    await session.commit()
+    return messages
+
+
+async def mark_outbox_message_sent(session: AsyncSession, message_id: int):
+    await session.execute(
+        update(OutboxMessage).
+        where(OutboxMessage.id == message_id).
+        values(status='sent', processed_at=utc_now(), last_error=None)
+    )
+
+
+async def purge_processed_outbox_messages(
+    session: AsyncSession,
+    older_than: datetime.timedelta,
+    limit: int
+) -> int:
+    # Удаляет отправленные и окончательно неудачные сообщения: их payload
+    # хранит тексты заказов и данные покупателей.
+    ids = (
+        select(OutboxMessage.id).
+        where(
+            OutboxMessage.status.in_(('sent', 'failed')),
+            OutboxMessage.processed_at < utc_now() - older_than
+        ).
+        limit(limit)
+    )
+    result = await session.execute(
+        delete(OutboxMessage).
+        where(OutboxMessage.id.in_(ids)).
+        execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def mark_outbox_message_failed(
+    session: AsyncSession,
+    message_id: int,
+    payload: dict[str, Any],
+    error: str,
+    retry_in: float = None
+):
+    values = {"payload": payload, "last_error": error}
+    if retry_in is None:
+        values.update(status='failed', processed_at=utc_now())
+    else:
+        values["available_at"] = (
+            utc_now() + datetime.timedelta(seconds=retry_in))
+    await session.execute(
+        update(OutboxMessage).
+        where(OutboxMessage.id == message_id).
+        values(**values)
+    )
@@ -0,0 +1,31 @@
+import datetime
+from typing import Any
+
+from sqlalchemy import Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base, intpk, str_64, created_at
+
+
+class OutboxMessage(Base):
+    __tablename__ = "outbox_messages"
+
+    id: Mapped[intpk]
+    event_type: Mapped[str_64]
+    payload: Mapped[dict[str, Any]]
+    status: Mapped[str_64] = mapped_column(server_default=text("'pending'"))
+    attempts: Mapped[int] = mapped_column(server_default=text("0"))
+    available_at: Mapped[datetime.datetime] = mapped_column(
+        server_default=text("TIMEZONE('utc', now())"))
+    last_error: Mapped[str | None]
+    created_at: Mapped[created_at]
+    processed_at: Mapped[datetime.datetime | None]
+
+    __table_args__ = (
+        Index(
+            'ix_outbox_messages_pending',
+            'available_at',
+            postgresql_where=text("status = 'pending'")
+        ),
+        {'schema': 'public'},
+    )
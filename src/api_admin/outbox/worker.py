@@ -0,0 +1,174 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter
+)
+
+from src.config import settings
+from src.database import async_session_maker
+from .crud import (
+    claim_outbox_messages,
+    mark_outbox_message_failed,
+    mark_outbox_message_sent,
+    purge_processed_outbox_messages
+)
+from .models import OutboxMessage
+
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 5000
+
+OutboxHandler = Callable[[dict, AsyncSession], Awaitable[None]]
+handlers: Dict[str, OutboxHandler] = {}
+
+
+def outbox_handler(event_type: str):
+    """
+    Регистрирует обработчик событий outbox. Обработчик может изменять
+    payload: при повторной попытке он получит сохранённую версию,
+    что позволяет не повторять уже выполненные шаги.
+    """
+    def decorator(func: OutboxHandler) -> OutboxHandler:
+        handlers[event_type] = func
+        return func
+    return decorator
+
+
+def backoff(attempts: int) -> float:
+    return min(
+        settings.OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1),
+        settings.OUTBOX_BACKOFF_MAX
+    )
+
+
+class OutboxWorker:
+    def __init__(self):
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task = None
+        self._purged_at: Optional[float] = None
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self._purge_if_due()
+            try:
+                processed = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox worker error: {e}")
+                processed = 0
+            if processed >= settings.OUTBOX_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), settings.OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _purge_if_due(self):
+        now = time.monotonic()
+        if (
+            self._purged_at is not None and
+            now - self._purged_at < settings.OUTBOX_PURGE_INTERVAL
+        ):
+            return
+        self._purged_at = now
+        try:
+            deleted = await self.purge()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Outbox purge error: {e}")
+            return
+        if deleted:
+            logger.info(f"Outbox purge: {deleted} messages deleted")
+
+    async def purge(self) -> int:
+        """
+        Удаляет обработанные сообщения старше OUTBOX_RETENTION_DAYS
+        пачками по PURGE_BATCH_SIZE, каждая в своей транзакции.
+        """
+        older_than = datetime.timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+        deleted = 0
+        while True:
+            async with async_session_maker() as session:
+                count = await purge_processed_outbox_messages(
+                    session, older_than, PURGE_BATCH_SIZE)
+                await session.commit()
+            deleted += count
+            if count < PURGE_BATCH_SIZE:
+                return deleted
+
+    async def process_batch(self) -> int:
+        async with async_session_maker() as session:
+            messages = await claim_outbox_messages(
+                session,
+                limit=settings.OUTBOX_BATCH_SIZE,
+                lease=settings.OUTBOX_LEASE_TIMEOUT
+            )
+        await asyncio.gather(
+            *(self._process(message) for message in messages))
+        return len(messages)
+
+    async def _process(self, message: OutboxMessage):
+        payload = dict(message.payload)
+        async with async_session_maker() as session:
+            handler = handlers.get(message.event_type)
+            try:
+                if handler is None:
+                    raise LookupError(
+                        f"No outbox handler for {message.event_type}")
+                await handler(payload, session)
+            except (
+                LookupError,
+                TelegramBadRequest,
+                TelegramForbiddenError
+            ) as e:
+                await session.rollback()
+                logger.error(f"Outbox message {message.id} failed: {e}")
+                await mark_outbox_message_failed(
+                    session, message.id, payload, str(e))
+            except Exception as e:
+                await session.rollback()
+                if isinstance(e, TelegramRetryAfter):
+                    retry_in = e.retry_after
+                else:
+                    retry_in = backoff(message.attempts)
+                if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    retry_in = None
+                logger.warning(
+                    f"Outbox message {message.id} attempt "
+                    f"{message.attempts} failed: {e}")
+                await mark_outbox_message_failed(
+                    session, message.id, payload, str(e), retry_in)
+            else:
+                await mark_outbox_message_sent(session, message.id)
+            await session.commit()
+
+
+outbox_worker = OutboxWorker()
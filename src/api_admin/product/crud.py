@@ -12,6 +12,7 @@ from .schemas import (
     UnitList, UnitCreate, UnitUpdate
 )
 from src.database import get_async_session
+from src.cache import invalidate_catalog
 
 
 async def crud_create_new_product(
@@ -33,6 +34,7 @@ async def crud_create_new_product(
         )
         await session.execute(stmt)
         await session.commit()
+        await invalidate_catalog(schema)
         return {"status": 201, }
     except Exception as e:
         await session.rollback()
@@ -60,6 +62,7 @@ async def crud_update_product(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"status": "success", 'date': data}
 
 
@@ -80,6 +83,7 @@ async def crud_change_delete_flag_product(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"message": "Статус для deleted_flag изменен"}
 
 
@@ -96,6 +100,7 @@ async def crud_delete_product(
         )
         await session.execute(stmt)
         await session.commit()
+        await invalidate_catalog(schema)
         return {
             "status": "success",
             "message": f"Категория, c id {product_id}, успешно удалена."
@@ -134,6 +139,7 @@ async def crud_update_product_field(
             execution_options(schema_translate_map={None: schema}))
         await session.execute(stmt)
         await session.commit()
+        await invalidate_catalog(schema)
         return {"message": f"Статус для {checkbox} изменен"}
     else:
         raise ValueError(f"Недопустимое значение checkbox: {checkbox}")
@@ -170,6 +176,7 @@ async def crud_create_new_unit(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"status": 201, 'date': data}
 
 
@@ -191,6 +198,7 @@ async def crud_update_unit(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"status": "success", 'date': data}
 
 
@@ -204,6 +212,7 @@ async def crud_delete_unit(
             schema_translate_map={None: schema})
         await session.execute(stmt)
         await session.commit()
+        await invalidate_catalog(schema)
         return {
             "status": "success",
             "message": f"Категория, c id {unit_id}, успешно удалена."
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from src.database import (
     Base, intpk, str_64,
@@ -82,3 +82,12 @@ class Product(Base):
     def __init__(self, schema):
         super().__init__()
         self.__table_args__ = {'schema': schema}
+
+    __table_args__ = (
+        # Витрина: неудалённые товары магазина, популярные первыми.
+        Index(
+            "ix_products_store_id_popular_id",
+            "store_id", text("popular DESC"), text("id DESC"),
+            postgresql_where=text("deleted_flag IS false")
+        ),
+    )
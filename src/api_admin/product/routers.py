@@ -1,13 +1,12 @@
-import datetime
-
-from PIL import Image
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, UploadFile
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
+from src.images import process_and_upload_variants, variant_keys
+from src.storage import storage
 from .models import Product
 from .schemas import ProductList, ProductCreate, ProductUpdate
 from .crud import (
@@ -18,10 +17,7 @@ from .crud import (
     crud_delete_product,
 )
 from ..user import User
-from .controller import s3
-from ..auth.routers import get_current_user_from_token
-from src.config import settings
-import io
+from ..auth.routers import get_current_user_from_token, get_tenant_session
 
 router = APIRouter(
     prefix="/api/v1/product",
@@ -130,31 +126,8 @@ async def process_and_upload_photo(
     current_user: User = Depends(get_current_user_from_token)
 ):
     try:
-        image = Image.open(io.BytesIO(await file.read()))
-
-        image.thumbnail((900, 900))
-
-        with io.BytesIO() as output_buffer:
-            image.save(output_buffer, format="WebP")
-            output_buffer.seek(0)
-            webp_image = Image.open(output_buffer)
-
-        current_datetime = datetime.now()
-        current_date_str = current_datetime.strftime("%Y-%m-%d_%H-%M-%S")
-
-        object_key = (
-            f"{current_user.id}/{store_id}/{current_date_str}_{file.filename}"
-        )
-
-        with io.BytesIO() as webp_output_buffer:
-            webp_image.save(webp_output_buffer, format="WebP")
-            webp_output_buffer.seek(0)
-            s3.upload_fileobj(webp_output_buffer,
-                              settings.BUCKET_NAME, object_key)
-
-        object_url = (
-            f'{settings.ENDPOINT_URL}/{settings.BUCKET_NAME}/{object_key}'
-        )
+        object_url = await process_and_upload_variants(
+            await file.read(), f"{current_user.id}/{store_id}")
 
         return object_url
     except Exception as e:
@@ -165,11 +138,28 @@ async def process_and_upload_photo(
 async def delete_photo(
     photo_name: str,
     store_id: int,
-    current_user: User = Depends(get_current_user_from_token)
+    product_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user_from_token),
+    session: AsyncSession = Depends(get_tenant_session)
 ):
+    """
+    Одинаковые файлы хранятся под одним sha256, поэтому картинку могут
+    использовать несколько товаров. Файлы удаляются, только если на них
+    не ссылается ни один товар, кроме product_id.
+    """
     try:
         object_key = f"{current_user.id}/{store_id}/{photo_name}"
-        s3.delete_object(Bucket=settings.BUCKET_NAME, Key=object_key)
+        query = (
+            select(Product.id).
+            where(Product.image == storage.url(object_key)).
+            limit(1)
+        )
+        if product_id is not None:
+            query = query.where(Product.id != product_id)
+        result = await session.execute(query)
+        if result.scalar() is not None:
+            return f'File {photo_name} is used by other products'
+        await storage.delete(*variant_keys(object_key))
         return f'File {photo_name} successfully deleted'
     except Exception as e:
         return f'Error deleting file {photo_name}: {str(e)}'
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, computed_field
 from typing import Optional
 
+from src.images import variant_url
+
 
 class UnitBase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -45,6 +47,16 @@ class ProductListStore(BaseModel):
     takeaway: bool
     dinein: bool
 
+    @computed_field
+    @property
+    def image_thumb(self) -> Optional[str]:
+        return variant_url(self.image, "thumb")
+
+    @computed_field
+    @property
+    def image_card(self) -> Optional[str]:
+        return variant_url(self.image, "card")
+
 
 class ProductOne(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -11,6 +11,7 @@ from src.api_admin.customer.routers import router as router_customer
 from src.api_admin.order.routers import router as router_order
 from src.api_admin.mail.controller import router as router_mail
 from src.api_admin.test.routers import router as router_test
+from src.api_admin.metrics.routers import router as router_metrics
 
 
 routers = (
@@ -27,4 +28,5 @@ routers = (
     router_order,
     router_customer,
     router_cart,
+    router_metrics,
 )
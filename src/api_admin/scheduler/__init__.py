@@ -0,0 +1,5 @@
+from .models import ScheduledJob
+
+all = [
+    ScheduledJob,
+]
@@ -0,0 +1,128 @@
+import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from .models import ScheduledJob
+
+
+def utc_now():
+    return func.timezone('utc', func.now())
+
+
+async def create_scheduled_job(
+    session: AsyncSession,
+    kind: str,
+    payload: dict[str, Any],
+    run_at: datetime.datetime
+):
+    """
+    Добавляет задачу в текущей транзакции, без commit.
+    """
+    await session.execute(
+        insert(ScheduledJob).
+        values(kind=kind, payload=payload, run_at=run_at)
+    )
+
+
+async def claim_due_jobs(
+    session: AsyncSession,
+    limit: int,
+    lease: float
+) -> List[ScheduledJob]:
+    # Задача переносится на время аренды: если процесс упадёт,
+    # не отметив результат, она снова станет доступной.
+    ids = (
+        select(ScheduledJob.id).
+        where(
+            ScheduledJob.status == 'pending',
+            ScheduledJob.run_at <= utc_now()
+        ).
+        order_by(ScheduledJob.run_at, ScheduledJob.id).
+        limit(limit).
+        with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(ScheduledJob).
+        where(ScheduledJob.id.in_(ids)).
+        values(
+            attempts=ScheduledJob.attempts + 1,
+            run_at=utc_now() + datetime.timedelta(seconds=lease)
+        ).
+        returning(ScheduledJob).
+        execution_options(synchronize_session=False)
+    )
+    result = await session.execute(stmt)
+    jobs = result.scalars().all()
+    await session.commit()
+    return jobs
+
+
+async def get_next_run_at(
+    session: AsyncSession
+) -> Optional[datetime.datetime]:
+    result = await session.execute(
+        select(func.min(ScheduledJob.run_at)).
+        where(ScheduledJob.status == 'pending')
+    )
+    return result.scalar()
+
+
+async def extend_job_lease(session: AsyncSession, job_id: int, lease: float):
+    await session.execute(
+        update(ScheduledJob).
+        where(
+            ScheduledJob.id == job_id,
+            ScheduledJob.status == 'pending'
+        ).
+        values(run_at=utc_now() + datetime.timedelta(seconds=lease))
+    )
+
+
+async def mark_job_done(session: AsyncSession, job_id: int):
+    await session.execute(
+        update(ScheduledJob).
+        where(ScheduledJob.id == job_id).
+        values(status='done', processed_at=utc_now(), last_error=None)
+    )
+
+
+async def purge_processed_jobs(
+    session: AsyncSession,
+    older_than: datetime.timedelta,
+    limit: int
+) -> int:
+    ids = (
+        select(ScheduledJob.id).
+        where(
+            ScheduledJob.status.in_(('done', 'failed')),
+            ScheduledJob.processed_at < utc_now() - older_than
+        ).
+        limit(limit)
+    )
+    result = await session.execute(
+        delete(ScheduledJob).
+        where(ScheduledJob.id.in_(ids)).
+        execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def mark_job_failed(
+    session: AsyncSession,
+    job_id: int,
+    error: str,
+    retry_in: float = None
+):
+    values = {"last_error": error}
+    if retry_in is None:
+        values.update(status='failed', processed_at=utc_now())
+    else:
+        values["run_at"] = utc_now() + datetime.timedelta(seconds=retry_in)
+    await session.execute(
+        update(ScheduledJob).
+        where(ScheduledJob.id == job_id).
+        values(**values)
+    )
@@ -0,0 +1,30 @@
+import datetime
+from typing import Any
+
+from sqlalchemy import Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base, intpk, str_64, created_at
+
+
+class ScheduledJob(Base):
+    __tablename__ = "scheduled_jobs"
+
+    id: Mapped[intpk]
+    kind: Mapped[str_64]
+    payload: Mapped[dict[str, Any]]
+    run_at: Mapped[datetime.datetime]
+    status: Mapped[str_64] = mapped_column(server_default=text("'pending'"))
+    attempts: Mapped[int] = mapped_column(server_default=text("0"))
+    last_error: Mapped[str | None]
+    created_at: Mapped[created_at]
+    processed_at: Mapped[datetime.datetime | None]
+
+    __table_args__ = (
+        Index(
+            'ix_scheduled_jobs_pending',
+            'run_at',
+            postgresql_where=text("status = 'pending'")
+        ),
+        {'schema': 'public'},
+    )
@@ -0,0 +1,287 @@
+import asyncio
+import datetime
+import heapq
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database import async_session_maker
+from .crud import (
+    claim_due_jobs,
+    create_scheduled_job,
+    extend_job_lease,
+    get_next_run_at,
+    mark_job_done,
+    mark_job_failed,
+    purge_processed_jobs
+)
+from .models import ScheduledJob
+
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 5000
+
+JobHandler = Callable[[dict, AsyncSession], Awaitable[None]]
+FailureHandler = Callable[[dict, str, AsyncSession], Awaitable[None]]
+handlers: Dict[str, JobHandler] = {}
+failure_handlers: Dict[str, FailureHandler] = {}
+
+
+def job_handler(kind: str, on_failure: Optional[FailureHandler] = None):
+    """
+    on_failure вызывается в отдельной сессии, когда задача завершилась
+    ошибкой и повторов больше не будет.
+    """
+    def decorator(func: JobHandler) -> JobHandler:
+        handlers[kind] = func
+        if on_failure is not None:
+            failure_handlers[kind] = on_failure
+        return func
+    return decorator
+
+
+def backoff(attempts: int) -> float:
+    return min(
+        settings.SCHEDULER_BACKOFF_BASE * 2 ** (attempts - 1),
+        settings.SCHEDULER_BACKOFF_MAX
+    )
+
+
+class Scheduler:
+    """
+    Отложенные задачи хранятся в таблице scheduled_jobs, поэтому переживают
+    перезапуск. Один фоновый цикл держит кучу ближайших моментов запуска,
+    спит до ближайшего из них и забирает готовые задачи пачками. Каждая
+    задача выполняется отдельной asyncio-задачей, поэтому долгие задачи
+    вроде рассылок не задерживают остальные. Одновременно выполняется не
+    больше SCHEDULER_BATCH_SIZE задач.
+    """
+
+    def __init__(self):
+        self._heap: List[datetime.datetime] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task = None
+        self._running: Set[asyncio.Task] = set()
+        self._purged_at: Optional[float] = None
+
+    async def schedule(
+        self,
+        session: AsyncSession,
+        kind: str,
+        payload: dict[str, Any],
+        delay: float = 0
+    ) -> datetime.datetime:
+        """
+        Создаёт задачу в транзакции session. Задача будет выполнена
+        после commit этой транзакции.
+        """
+        run_at = datetime.datetime.utcnow() + datetime.timedelta(
+            seconds=delay)
+        await create_scheduled_job(session, kind, payload, run_at)
+        self.notify(run_at)
+        return run_at
+
+    def notify(self, run_at: datetime.datetime):
+        if not self._heap or run_at < self._heap[0]:
+            self._wakeup.set()
+        heapq.heappush(self._heap, run_at)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Прерванные задачи снова станут доступны после окончания аренды.
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    def free_slots(self) -> int:
+        return settings.SCHEDULER_BATCH_SIZE - len(self._running)
+
+    async def _run(self):
+        while True:
+            # Сброс до обращений к базе: notify() во время process_batch
+            # или чтения ближайшего run_at не потеряется.
+            self._wakeup.clear()
+            await self._purge_if_due()
+            try:
+                processed = await self.process_batch()
+                if processed and self.free_slots() > 0:
+                    continue
+                if self.free_slots() > 0:
+                    timeout = await self._next_timeout()
+                else:
+                    # Свободный слот разбудит цикл через _job_finished.
+                    timeout = settings.SCHEDULER_POLL_INTERVAL
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scheduler error: {e}")
+                timeout = settings.SCHEDULER_POLL_INTERVAL
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _purge_if_due(self):
+        now = time.monotonic()
+        if (
+            self._purged_at is not None and
+            now - self._purged_at < settings.SCHEDULER_PURGE_INTERVAL
+        ):
+            return
+        self._purged_at = now
+        try:
+            deleted = await self.purge()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Scheduler purge error: {e}")
+            return
+        if deleted:
+            logger.info(f"Scheduler purge: {deleted} jobs deleted")
+
+    async def purge(self) -> int:
+        """
+        Удаляет выполненные и окончательно неудачные задачи старше
+        SCHEDULER_RETENTION_DAYS пачками по PURGE_BATCH_SIZE.
+        """
+        older_than = datetime.timedelta(
+            days=settings.SCHEDULER_RETENTION_DAYS)
+        deleted = 0
+        while True:
+            async with async_session_maker() as session:
+                count = await purge_processed_jobs(
+                    session, older_than, PURGE_BATCH_SIZE)
+                await session.commit()
+            deleted += count
+            if count < PURGE_BATCH_SIZE:
+                return deleted
+
+    async def _next_timeout(self) -> float:
+        now = datetime.datetime.utcnow()
+        while self._heap and self._heap[0] <= now:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            # Задачи из других процессов и оставшиеся после перезапуска
+            # известны только базе.
+            async with async_session_maker() as session:
+                next_run_at = await get_next_run_at(session)
+            if next_run_at is not None:
+                heapq.heappush(self._heap, next_run_at)
+        timeout = settings.SCHEDULER_POLL_INTERVAL
+        if self._heap:
+            delay = (self._heap[0] - now).total_seconds()
+            timeout = max(0, min(delay, timeout))
+        return timeout
+
+    async def process_batch(self) -> int:
+        limit = self.free_slots()
+        if limit <= 0:
+            return 0
+        async with async_session_maker() as session:
+            jobs = await claim_due_jobs(
+                session,
+                limit=limit,
+                lease=settings.SCHEDULER_LEASE_TIMEOUT
+            )
+        for job in jobs:
+            task = asyncio.create_task(self._run_job(job))
+            self._running.add(task)
+            task.add_done_callback(self._job_finished)
+        return len(jobs)
+
+    def _job_finished(self, task: asyncio.Task):
+        self._running.discard(task)
+        self._wakeup.set()
+
+    async def _run_job(self, job: ScheduledJob):
+        error, retry_in = await self._execute(job)
+        try:
+            async with async_session_maker() as session:
+                if error is None:
+                    await mark_job_done(session, job.id)
+                else:
+                    await mark_job_failed(session, job.id, error, retry_in)
+                await session.commit()
+        except Exception as e:
+            # Задача останется арендованной и повторится после аренды.
+            logger.error(f"Scheduled job {job.id} result not saved: {e}")
+
+    async def _execute(self, job: ScheduledJob):
+        handler = handlers.get(job.kind)
+        if handler is None:
+            return f"No job handler for {job.kind}", None
+        keep_lease = asyncio.create_task(self._keep_lease(job.id))
+        try:
+            error, retry_in = await self._call_handler(handler, job)
+        finally:
+            keep_lease.cancel()
+        if error is not None and retry_in is None:
+            await self._on_failure(job, error)
+        return error, retry_in
+
+    async def _keep_lease(self, job_id: int):
+        # Пока обработчик работает, аренда продлевается, иначе долгая
+        # задача снова стала бы доступной и выполнилась бы дважды.
+        lease = settings.SCHEDULER_LEASE_TIMEOUT
+        while True:
+            await asyncio.sleep(lease / 2)
+            try:
+                async with async_session_maker() as session:
+                    await extend_job_lease(session, job_id, lease)
+                    await session.commit()
+            except Exception as e:
+                logger.warning(
+                    f"Scheduled job {job_id} lease not extended: {e}")
+
+    async def _on_failure(self, job: ScheduledJob, error: str):
+        on_failure = failure_handlers.get(job.kind)
+        if on_failure is None:
+            return
+        async with async_session_maker() as session:
+            try:
+                await on_failure(dict(job.payload), error, session)
+                await session.commit()
+            except Exception as e:
+                logger.error(
+                    f"Scheduled job {job.id} failure handler failed: {e}")
+
+    async def _call_handler(self, handler: JobHandler, job: ScheduledJob):
+        async with async_session_maker() as session:
+            try:
+                await handler(dict(job.payload), session)
+                await session.commit()
+            except (TelegramBadRequest, TelegramForbiddenError) as e:
+                logger.error(f"Scheduled job {job.id} failed: {e}")
+                return str(e), None
+            except Exception as e:
+                logger.warning(
+                    f"Scheduled job {job.id} attempt {job.attempts} "
+                    f"failed: {e}")
+                if job.attempts >= settings.SCHEDULER_MAX_ATTEMPTS:
+                    return str(e), None
+                if isinstance(e, TelegramRetryAfter):
+                    return str(e), e.retry_after
+                return str(e), backoff(job.attempts)
+        return None, None
+
+
+scheduler = Scheduler()
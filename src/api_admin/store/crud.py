@@ -2,12 +2,16 @@ from typing import List, Optional
 from datetime import datetime
 from fastapi import Depends, HTTPException
 from sqlalchemy import insert, select, delete, update
-from sqlalchemy.orm import joinedload, Session
+from sqlalchemy.orm import joinedload, selectinload, Session
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.services import add_new_bot
+from src.cache import cache, invalidate_stores, store_key
+from src.config import settings
 from src.database import get_async_session
+from src.tenancy import tenant_schema
+from .snapshot import invalidate_store_config
 from .models import (
     Store, WorkingDay, StoreInfo,
     StoreOrderTypeAssociation, BotToken, DeliveryFix,
@@ -28,7 +32,6 @@ from .schemas import (
 
 
 async def crud_get_all_stores(
-    schema: str,
     session: AsyncSession = Depends(get_async_session)
 ):
     query = (
@@ -37,47 +40,58 @@ async def crud_get_all_stores(
             joinedload(Store.info),
             joinedload(Store.subscriptions)
         ).
-        order_by(Store.id.desc()).
-        execution_options(
-            schema_translate_map={None: schema}
-        )
+        order_by(Store.id.desc())
     )
     result = await session.execute(query)
     stores = result.scalars().all()
     return stores
 
 
+async def invalidate_store_cache(session: AsyncSession):
+    schema = tenant_schema(session)
+    if schema is not None:
+        await invalidate_stores(schema)
+        await invalidate_store_config(schema)
+
+
 async def crud_get_one_stores(
     store_id: int,
-    schema: str,
     session: AsyncSession = Depends(get_async_session)
 ) -> Optional[OneStore]:
+    schema = tenant_schema(session)
+    if schema is not None:
+        cached = await cache.get(store_key(schema, store_id))
+        if cached is not None:
+            return OneStore.model_validate(cached)
+
+    # Связи один-к-одному присоединяются в основном запросе, а списки
+    # загружаются отдельными запросами, чтобы строки не размножались.
     query = (
         select(Store).
         where(Store.id == store_id).
         options(
             joinedload(Store.info).
-            options(joinedload(StoreInfo.types_delivery)),
+            joinedload(StoreInfo.types_delivery),
             joinedload(Store.subscriptions),
-            joinedload(Store.association).
-            options(joinedload(StoreOrderTypeAssociation.order_type)),
-            joinedload(Store.working_days).
-            options(joinedload(WorkingDay.days_of_week)),
             joinedload(Store.payments),
             joinedload(Store.service_text_and_chats),
-            joinedload(Store.legal_information)
-        ).
-        execution_options(schema_translate_map={None: schema})
+            joinedload(Store.legal_information),
+            selectinload(Store.association).
+            joinedload(StoreOrderTypeAssociation.order_type),
+            selectinload(Store.working_days).
+            joinedload(WorkingDay.days_of_week)
+        )
     )
     result = await session.execute(query)
     store = result.scalar()
+    if store is None:
+        return None
     type_delivery_id = store.info.type_delivery_id
 
     if type_delivery_id:
         delivery_info = await get_delyvery_type_info(
             type_delivery_id=type_delivery_id,
             store_id=store_id,
-            schema=schema,
             session=session
         )
         store.delivery_info = delivery_info
@@ -88,13 +102,19 @@ async def crud_get_one_stores(
 
     store.bot_tokens = bot_token
 
+    store = OneStore.model_validate(store)
+    if schema is not None:
+        await cache.set(
+            store_key(schema, store_id),
+            store.model_dump(mode="json"),
+            ttl=settings.STORE_CACHE_TTL
+        )
     return store
 
 
 async def get_delyvery_type_info(
     type_delivery_id: int,
     store_id: int,
-    schema: str,
     session: AsyncSession = Depends(get_async_session)
 ):
     model_mapping = {
@@ -107,8 +127,7 @@ async def get_delyvery_type_info(
         return None
     query = (
         select(selected_model).
-        where(selected_model.store_id == store_id).
-        execution_options(schema_translate_map={None: schema})
+        where(selected_model.store_id == store_id)
     )
     result = await session.execute(query)
     if type_delivery_id == 2:
@@ -151,7 +170,6 @@ async def read_test_many_to_many(
 
 
 async def crud_create_new_store(
-    schema: str,
     user_id: int,
     session: AsyncSession = Depends(get_async_session)
 ):
@@ -161,25 +179,23 @@ async def crud_create_new_store(
             user_id=user_id,
             created_by=user_id
         ).
-        execution_options(schema_translate_map={None: schema}).
         returning(Store.id)
     )
     result = await session.execute(stmt)
     new_store_id = result.scalar()
     await session.commit()
+    await invalidate_store_cache(session)
 
     return {"status": 201, "id": new_store_id, }
 
 
 async def crud_create_new_store_and_bot(
-    schema: str,
     data: StoreCreate,
     token_bot: BotTokenCreate,
     user_id: int,
     session: AsyncSession = Depends(get_async_session)
 ):
     store_result = await crud_create_new_store(
-        schema=schema,
         user_id=user_id,
         session=session
     )
@@ -198,27 +214,23 @@ async def crud_create_new_store_and_bot(
         values(
             **data.model_dump(),
             store_id=store_id
-        ).
-        execution_options(schema_translate_map={None: schema}))
+        )
+    )
     await session.execute(
         insert(StoreSubscription).
-        values(store_id=store_id).
-        execution_options(schema_translate_map={None: schema})
+        values(store_id=store_id)
     )
     await session.execute(
         insert(StorePayment).
-        values(store_id=store_id).
-        execution_options(schema_translate_map={None: schema})
+        values(store_id=store_id)
     )
     await session.execute(
         insert(ServiceTextAndChat).
-        values(store_id=store_id).
-        execution_options(schema_translate_map={None: schema})
+        values(store_id=store_id)
     )
     await session.execute(
         insert(LegalInformation).
-        values(store_id=store_id).
-        execution_options(schema_translate_map={None: schema})
+        values(store_id=store_id)
     )
     order_type_values = [{'store_id': store_id, 'order_type_id': order_type_id,
                           'is_active': False} for order_type_id in range(1, 4)]
@@ -232,20 +244,18 @@ async def crud_create_new_store_and_bot(
 
     await session.execute(
         insert(StoreOrderTypeAssociation).
-        values(order_type_values).
-        execution_options(schema_translate_map={None: schema})
+        values(order_type_values)
     )
     await session.execute(
         insert(WorkingDay).
-        values(working_day_values).
-        execution_options(schema_translate_map={None: schema})
+        values(working_day_values)
     )
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": 201}
 
 
 async def crud_update_store(
-    schema: str,
     user_id: int,
     store_id: int,
     data: StoreUpdate,
@@ -254,23 +264,21 @@ async def crud_update_store(
     stmt = (
         update(StoreInfo).
         where(StoreInfo.store_id == store_id).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_get_legal_informations(
     store_id: int,
-    schema: str,
     session: AsyncSession = Depends(get_async_session)
 ):
     query = (
         select(LegalInformation).
-        where(LegalInformation.store_id == store_id).
-        execution_options(schema_translate_map={None: schema})
+        where(LegalInformation.store_id == store_id)
     )
     result = await session.execute(query)
     store = result.scalar()
@@ -278,7 +286,6 @@ async def crud_get_legal_informations(
 
 
 async def crud_update_store_info(
-    schema: str,
     user_id: int,
     store_id: int,
     data: UpdateStoreInfo,
@@ -287,16 +294,15 @@ async def crud_update_store_info(
     stmt = (
         update(StoreInfo).
         where(StoreInfo.store_id == store_id).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_update_store_legal_informations(
-    schema: str,
     user_id: int,
     store_id: int,
     data: UpdateLegalInformation,
@@ -305,32 +311,30 @@ async def crud_update_store_legal_informations(
     stmt = (
         update(LegalInformation).
         where(LegalInformation.store_id == store_id).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_create_store_delivery_distance(
-    schema: str,
     user_id: int,
     data: PostDeliveryDistance,
     session: AsyncSession = Depends(get_async_session)
 ) -> List[PostDeliveryDistance]:
     stmt = (
         insert(DeliveryDistance).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_update_store_delivery_distance(
-    schema: str,
     user_id: int,
     store_id: int,
     data: UpdateDeliveryDistance,
@@ -339,32 +343,30 @@ async def crud_update_store_delivery_distance(
     stmt = (
         update(DeliveryDistance).
         where(DeliveryDistance.store_id == store_id).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_create_store_delivery_fix(
-    schema: str,
     user_id: int,
     data: PostDeliveryFix,
     session: AsyncSession = Depends(get_async_session)
 ) -> List[PostDeliveryFix]:
     stmt = (
         insert(DeliveryFix).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_update_store_delivery_fix(
-    schema: str,
     user_id: int,
     store_id: int,
     data: UpdateDeliveryFix,
@@ -373,32 +375,30 @@ async def crud_update_store_delivery_fix(
     stmt = (
         update(DeliveryFix).
         where(DeliveryFix.store_id == store_id).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_create_store_delivery_district(
-    schema: str,
     user_id: int,
     data: PostDeliveryDistrict,
     session: AsyncSession = Depends(get_async_session)
 ) -> List[PostDeliveryDistrict]:
     stmt = (
         insert(DeliveryDistrict).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_update_store_delivery_district(
-    schema: str,
     user_id: int,
     store_id: int,
     delivery_id: int,
@@ -408,23 +408,21 @@ async def crud_update_store_delivery_district(
     stmt = (
         update(DeliveryDistrict).
         where(DeliveryDistrict.id == delivery_id).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_get_service_text_and_chats(
     store_id: int,
-    schema: str,
     session: AsyncSession = Depends(get_async_session)
 ):
     query = (
         select(ServiceTextAndChat).
-        where(ServiceTextAndChat.store_id == store_id).
-        execution_options(schema_translate_map={None: schema})
+        where(ServiceTextAndChat.store_id == store_id)
     )
     result = await session.execute(query)
     store = result.scalar()
@@ -432,7 +430,6 @@ async def crud_get_service_text_and_chats(
 
 
 async def crud_update_service_text_and_chats(
-    schema: str,
     user_id: int,
     store_id: int,
     data: UpdateServiceTextAndChat,
@@ -441,23 +438,21 @@ async def crud_update_service_text_and_chats(
     stmt = (
         update(ServiceTextAndChat).
         where(ServiceTextAndChat.store_id == store_id).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_get_store_payments(
     store_id: int,
-    schema: str,
     session: AsyncSession = Depends(get_async_session)
 ):
     query = (
         select(StorePayment).
-        where(StorePayment.store_id == store_id).
-        execution_options(schema_translate_map={None: schema})
+        where(StorePayment.store_id == store_id)
     )
     result = await session.execute(query)
     store = result.scalar()
@@ -465,7 +460,6 @@ async def crud_get_store_payments(
 
 
 async def crud_update_store_payments(
-    schema: str,
     user_id: int,
     store_id: int,
     data: UpdateStorePayment,
@@ -474,16 +468,15 @@ async def crud_update_store_payments(
     stmt = (
         update(StorePayment).
         where(StorePayment.store_id == store_id).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"status": "success", 'date': data}
 
 
 async def crud_change_delete_flag_store(
-    schema: str,
     user_id: int,
     store_id: int,
     session: AsyncSession = Depends(get_async_session)
@@ -494,25 +487,23 @@ async def crud_change_delete_flag_store(
         values(
             deleted_flag=~Store.deleted_flag,
             deleted_at=datetime.now(),
-            deleted_by=user_id).
-        execution_options(schema_translate_map={None: schema})
+            deleted_by=user_id)
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"message": "Статус для deleted_flag изменен"}
 
 
 async def crud_delete_store(
-    schema: str,
     store_id: int,
     session: Session = Depends(get_async_session)
 ):
     try:
-        stmt = delete(Store).where(Store.id == store_id).execution_options(
-            schema_translate_map={None: schema}
-        )
+        stmt = delete(Store).where(Store.id == store_id)
         await session.execute(stmt)
         await session.commit()
+        await invalidate_store_cache(session)
         return {
             "status": "success",
             "message": f"Магазин, c id {store_id}, успешно удалена."
@@ -532,7 +523,6 @@ async def crud_delete_store(
 
 
 async def crud_delete_delivery_district(
-    schema: str,
     store_id: int,
     delivery_id: int,
     session: Session = Depends(get_async_session)
@@ -543,11 +533,11 @@ async def crud_delete_delivery_district(
             where(
                 DeliveryDistrict.store_id == store_id,
                 DeliveryDistrict.id == delivery_id
-            ).
-            execution_options(schema_translate_map={None: schema})
+            )
         )
         await session.execute(stmt)
         await session.commit()
+        await invalidate_store_cache(session)
         return {
             "status": "success",
             "message": f"Район доставки, c id {store_id}, успешно удален."
@@ -567,23 +557,21 @@ async def crud_delete_delivery_district(
 
 
 async def crud_update_store_activity(
-    schema: str,
     store_id: int,
     session: Session = Depends(get_async_session)
 ):
     stmt = (
         update(StoreSubscription).
         where(StoreSubscription.store_id == store_id).
-        values(is_active=~StoreSubscription.is_active).
-        execution_options(schema_translate_map={None: schema})
+        values(is_active=~StoreSubscription.is_active)
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"message": "Изменён статус активности"}
 
 
 async def crud_update_order_type(
-    schema: str,
     store_id: int,
     order_type_id: int,
     session: Session = Depends(get_async_session)
@@ -594,11 +582,11 @@ async def crud_update_order_type(
             StoreOrderTypeAssociation.store_id == store_id,
             StoreOrderTypeAssociation.order_type_id == order_type_id
         ).
-        values(is_active=~StoreOrderTypeAssociation.is_active).
-        execution_options(schema_translate_map={None: schema})
+        values(is_active=~StoreOrderTypeAssociation.is_active)
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"message": "Изменён статус активности"}
 
 
@@ -609,6 +597,7 @@ async def crud_create_new_order_type(
     stmt = insert(OrderType).values(**data.model_dump())
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
 
     return {"status": 201, "data": data}
 
@@ -623,7 +612,6 @@ async def crud_get_all_order_types(
 
 
 async def crud_update_day_of_week(
-    schema: str,
     store_id: int,
     day_of_week_id: int,
     session: Session = Depends(get_async_session)
@@ -634,16 +622,15 @@ async def crud_update_day_of_week(
             WorkingDay.store_id == store_id,
             WorkingDay.day_of_week_id == day_of_week_id
         ).
-        values(is_active=~WorkingDay.is_working).
-        execution_options(schema_translate_map={None: schema})
+        values(is_active=~WorkingDay.is_working)
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
     return {"message": "Изменён статус активности"}
 
 
 async def crud_update_checkbox_payments(
-    schema: str,
     store_id: int,
     checkbox: str,
     session: Session = Depends(get_async_session)
@@ -654,18 +641,17 @@ async def crud_update_checkbox_payments(
         stmt = (
             update(StorePayment).
             where(StorePayment.store_id == store_id).
-            values(**{field_name: ~field_to_update}).
-            execution_options(schema_translate_map={None: schema})
+            values(**{field_name: ~field_to_update})
         )
         await session.execute(stmt)
         await session.commit()
+        await invalidate_store_cache(session)
         return {"message": f"Статус для {checkbox} изменен"}
     else:
         raise ValueError(f"Недопустимое значение checkbox: {checkbox}")
 
 
 async def crud_update_checkbox_store_info(
-    schema: str,
     store_id: int,
     checkbox: str,
     session: Session = Depends(get_async_session)
@@ -682,34 +668,32 @@ async def crud_update_checkbox_store_info(
         stmt = (
             update(StoreInfo).
             where(StoreInfo.store_id == store_id).
-            values(**values_to_update).
-            execution_options(schema_translate_map={None: schema})
+            values(**values_to_update)
         )
         await session.execute(stmt)
         await session.commit()
+        await invalidate_store_cache(session)
         return {"message": f"Статус для {checkbox} изменен"}
     else:
         raise ValueError(f"Недопустимое значение checkbox: {checkbox}")
 
 
 async def crud_create_new_store_order_types_association(
-    schema: str,
     data: BaseStoreOrderTypeAssociation,
     session: AsyncSession = Depends(get_async_session)
 ):
     stmt = (
         insert(StoreOrderTypeAssociation).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
 
     return {"status": 201, "data": data}
 
 
 async def crud_update_new_day_of_week(
-    schema: str,
     user_id: int,
     store_id: str,
     day_of_week_id: int,
@@ -722,11 +706,11 @@ async def crud_update_new_day_of_week(
             WorkingDay.store_id == store_id,
             WorkingDay.day_of_week_id == day_of_week_id
         ).
-        values(**data.model_dump()).
-        execution_options(schema_translate_map={None: schema})
+        values(**data.model_dump())
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_store_cache(session)
 
     return {"status": 201, "data": data}
 
@@ -2,8 +2,6 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from src.database import get_async_session
-
 from .crud import (
     crud_change_delete_flag_store,
     crud_create_new_store_and_bot,
@@ -38,7 +36,7 @@ from .schemas import (
     UpdateServiceTextAndChat
 )
 from ..user import User
-from ..auth.routers import get_current_user_from_token
+from ..auth.routers import get_current_user_from_token, get_tenant_session
 
 
 router = APIRouter(
@@ -49,11 +47,10 @@ router = APIRouter(
 @router.get("/", response_model=List[ListStoreInfo], status_code=200)
 async def get_all_store(
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         categories = await crud_get_all_stores(
-            schema=str(current_user.id),
             session=session
         )
         return categories
@@ -67,12 +64,11 @@ async def get_all_store(
 async def get_one_store(
     store_id: int,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         store = await crud_get_one_stores(
             store_id=store_id,
-            schema=str(current_user.id),
             session=session
         )
         return store
@@ -87,11 +83,10 @@ async def create_new_store(
     data: StoreCreate,
     token_bot: BotTokenCreate,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         new_store = await crud_create_new_store_and_bot(
-            schema=str(current_user.id),
             data=data,
             token_bot=token_bot,
             user_id=current_user.id,
@@ -109,11 +104,10 @@ async def update_store(
     store_id: int,
     data: StoreUpdate,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_update_store(
-            schema=str(current_user.id),
             store_id=store_id,
             data=data,
             user_id=current_user.id,
@@ -130,11 +124,10 @@ async def update_store(
 async def delete_store(
     store_id: int,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         change_store = await crud_delete_store(
-            schema=str(current_user.id),
             store_id=store_id,
             session=session
         )
@@ -149,11 +142,10 @@ async def delete_store(
 async def change_delete_flag_store(
     store_id: int,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         change_store = await crud_change_delete_flag_store(
-            schema=str(current_user.id),
             user_id=current_user.id,
             store_id=store_id,
             session=session
@@ -170,11 +162,10 @@ async def update_store_info(
     store_id: int,
     data: UpdateStoreInfo,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_update_store_info(
-            schema=str(current_user.id),
             store_id=store_id,
             data=data,
             user_id=current_user.id,
@@ -192,7 +183,7 @@ async def update_checkbox_store_info(
     store_id: int,
     checkbox: str,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     """
     # Параметры:
@@ -203,7 +194,6 @@ async def update_checkbox_store_info(
     """
     try:
         result = await crud_update_checkbox_store_info(
-            schema=str(current_user.id),
             store_id=store_id,
             checkbox=checkbox,
             session=session
@@ -219,11 +209,10 @@ async def update_checkbox_store_info(
 async def update_store_activity(
     store_id: int,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         result = await crud_update_store_activity(
-            schema=str(current_user.id),
             store_id=store_id,
             session=session
         )
@@ -239,11 +228,10 @@ async def update_order_type(
     store_id: int,
     order_type_id: int,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         result = await crud_update_order_type(
-            schema=str(current_user.id),
             store_id=store_id,
             order_type_id=order_type_id,
             session=session
@@ -261,11 +249,10 @@ async def update_new_day_of_week(
     day_of_week_id: int,
     data: UpdaneDayOfWeek,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         new_order_type = await crud_update_new_day_of_week(
-            schema=str(current_user.id),
             store_id=store_id,
             day_of_week_id=day_of_week_id,
             data=data,
@@ -284,11 +271,10 @@ async def update_day_of_week(
     store_id: int,
     day_of_week_id: int,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         result = await crud_update_day_of_week(
-            schema=str(current_user.id),
             store_id=store_id,
             day_of_week_id=day_of_week_id,
             session=session
@@ -305,11 +291,10 @@ async def update_store_payments(
     store_id: int,
     data: UpdateStorePayment,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_update_store_payments(
-            schema=str(current_user.id),
             store_id=store_id,
             data=data,
             user_id=current_user.id,
@@ -327,7 +312,7 @@ async def update_checkbox_payments(
     store_id: int,
     checkbox: str,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     """
     # Параметры:
@@ -337,7 +322,6 @@ async def update_checkbox_payments(
     """
     try:
         result = await crud_update_checkbox_payments(
-            schema=str(current_user.id),
             store_id=store_id,
             checkbox=checkbox,
             session=session
@@ -353,11 +337,10 @@ async def update_checkbox_payments(
 async def create_store_delivery_distance(
     data: PostDeliveryDistance,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_create_store_delivery_distance(
-            schema=str(current_user.id),
             data=data,
             user_id=current_user.id,
             session=session
@@ -374,11 +357,10 @@ async def update_store_delivery_distance(
     store_id: int,
     data: UpdateDeliveryDistance,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_update_store_delivery_distance(
-            schema=str(current_user.id),
             store_id=store_id,
             data=data,
             user_id=current_user.id,
@@ -395,11 +377,10 @@ async def update_store_delivery_distance(
 async def create_store_delivery_fix(
     data: PostDeliveryFix,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_create_store_delivery_fix(
-            schema=str(current_user.id),
             data=data,
             user_id=current_user.id,
             session=session
@@ -416,11 +397,10 @@ async def update_store_delivery_fix(
     store_id: int,
     data: UpdateDeliveryFix,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_update_store_delivery_fix(
-            schema=str(current_user.id),
             store_id=store_id,
             data=data,
             user_id=current_user.id,
@@ -438,11 +418,10 @@ async def create_store_delivery_district(
     store_id: int,
     data: PostDeliveryDistrict,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_create_store_delivery_district(
-            schema=str(current_user.id),
             data=data,
             user_id=current_user.id,
             session=session
@@ -461,11 +440,10 @@ async def update_store_delivery_district(
     delivery_id: int,
     data: UpdateDeliveryDistrict,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_update_store_delivery_district(
-            schema=str(current_user.id),
             store_id=store_id,
             delivery_id=delivery_id,
             data=data,
@@ -484,11 +462,10 @@ async def delete_delivery_district(
     store_id: int,
     delivery_id: int,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         change_store = await crud_delete_delivery_district(
-            schema=str(current_user.id),
             store_id=store_id,
             delivery_id=delivery_id,
             session=session
@@ -505,11 +482,10 @@ async def update_service_text_and_chats(
     store_id: int,
     data: UpdateServiceTextAndChat,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_update_service_text_and_chats(
-            schema=str(current_user.id),
             store_id=store_id,
             data=data,
             user_id=current_user.id,
@@ -527,11 +503,10 @@ async def update_store_legal_informations(
     store_id: int,
     data: UpdateLegalInformation,
     current_user: User = Depends(get_current_user_from_token),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_tenant_session)
 ):
     try:
         up_store = await crud_update_store_legal_informations(
-            schema=str(current_user.id),
             store_id=store_id,
             data=data,
             user_id=current_user.id,
@@ -501,3 +501,72 @@ class ListStoreInfo(BaseModel):
     id: int
     info: Optional[ListStoreInfoMini]
     subscriptions: Optional[InfoStoreSubscription]
+
+
+# Снимок настроек магазина для оформления заказа и бота
+
+class StoreConfigWorkingDay(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    day_of_week_id: int
+    number_day: Optional[int] = None
+    is_working: bool
+    opening_time: Optional[time] = None
+    closing_time: Optional[time] = None
+
+
+class StoreConfigOrderType(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    order_type_id: int
+    name: Optional[str] = None
+    is_active: bool
+
+
+class StoreConfigDeliveryDistance(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    start_price: int
+    price_per_km: int
+    min_price: int
+
+
+class StoreConfigDeliveryDistrict(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    id: int
+    name: str
+    price: int
+
+
+class StoreConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    user_id: int
+    store_id: int
+    version: str
+    token_bot: Optional[str] = None
+
+    name: Optional[str] = None
+    adress: Optional[str] = None
+    number_phone: Optional[str] = None
+    time_zone: Optional[str] = None
+    format_unified: bool = False
+    format_24_7: bool = False
+    format_custom: bool = False
+    open_hours_default: Optional[time] = None
+    close_hours_default: Optional[time] = None
+
+    cash: bool = False
+    card: bool = False
+    min_delivery_amount: Optional[int] = None
+    min_order_amount_for_free_delivery: Optional[int] = None
+
+    welcome_message_bot: Optional[str] = None
+    welcome_image: Optional[str] = None
+    tg_id_group: Optional[int] = None
+    order_chat: Optional[int] = None
+
+    type_delivery_id: Optional[int] = None
+    delivery_fix_price: Optional[int] = None
+    delivery_distance: Optional[StoreConfigDeliveryDistance] = None
+    delivery_districts: tuple[StoreConfigDeliveryDistrict, ...] = ()
+
+    working_days: tuple[StoreConfigWorkingDay, ...] = ()
+    order_types: tuple[StoreConfigOrderType, ...] = ()
@@ -0,0 +1,177 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from src.cache import cache
+from src.config import settings
+from src.tenancy import use_tenant
+from .models import (
+    Store,
+    BotToken,
+    StoreInfo,
+    StoreOrderTypeAssociation,
+    WorkingDay
+)
+from .schemas import (
+    StoreConfig,
+    StoreConfigDeliveryDistance,
+    StoreConfigDeliveryDistrict,
+    StoreConfigOrderType,
+    StoreConfigWorkingDay
+)
+
+
+def store_config_version_key(schema: str) -> str:
+    return f"store_config_version:{schema}"
+
+
+def store_config_key(schema: str, store_id: int, version: str) -> str:
+    return f"store_config:{schema}:{store_id}:{version}"
+
+
+async def get_store_config_version(schema: str) -> str:
+    version = await cache.get(store_config_version_key(schema))
+    if version is None:
+        version = uuid.uuid4().hex
+        await cache.set(
+            store_config_version_key(schema),
+            version,
+            ttl=settings.STORE_CACHE_TTL
+        )
+    return version
+
+
+async def invalidate_store_config(schema: str):
+    """
+    Снимки всех магазинов арендатора становятся недоступны: следующий
+    запрос создаст новую версию, а старые записи истекут сами.
+    """
+    await cache.delete(store_config_version_key(schema))
+
+
+async def load_store_config(
+    session: AsyncSession,
+    schema: str,
+    store_id: int,
+    version: str
+) -> Optional[StoreConfig]:
+    await use_tenant(session, schema)
+    query = (
+        select(Store).
+        where(Store.id == store_id).
+        options(
+            joinedload(Store.info),
+            joinedload(Store.payments),
+            joinedload(Store.service_text_and_chats),
+            joinedload(Store.delivery_fix),
+            joinedload(Store.delivery_distance),
+            selectinload(Store.delivery_district),
+            selectinload(Store.association).
+            joinedload(StoreOrderTypeAssociation.order_type),
+            selectinload(Store.working_days).
+            joinedload(WorkingDay.days_of_week)
+        )
+    )
+    result = await session.execute(query)
+    store = result.scalar()
+    if store is None:
+        return None
+    bot_token = await session.scalar(
+        select(BotToken.token_bot).
+        where(
+            BotToken.user_id == int(schema),
+            BotToken.store_id == store_id
+        )
+    )
+
+    info: StoreInfo = store.info
+    payments = store.payments
+    chats = store.service_text_and_chats
+    distance = store.delivery_distance
+    return StoreConfig(
+        user_id=int(schema),
+        store_id=store_id,
+        version=version,
+        token_bot=bot_token,
+        name=info.name if info else None,
+        adress=info.adress if info else None,
+        number_phone=info.number_phone if info else None,
+        time_zone=info.time_zone if info else None,
+        format_unified=info.format_unified if info else False,
+        format_24_7=info.format_24_7 if info else False,
+        format_custom=info.format_custom if info else False,
+        open_hours_default=info.open_hours_default if info else None,
+        close_hours_default=info.close_hours_default if info else None,
+        type_delivery_id=info.type_delivery_id if info else None,
+        cash=payments.cash if payments else False,
+        card=payments.card if payments else False,
+        min_delivery_amount=(
+            payments.min_delivery_amount if payments else None),
+        min_order_amount_for_free_delivery=(
+            payments.min_order_amount_for_free_delivery
+            if payments else None),
+        welcome_message_bot=chats.welcome_message_bot if chats else None,
+        welcome_image=chats.welcome_image if chats else None,
+        tg_id_group=chats.tg_id_group if chats else None,
+        order_chat=chats.order_chat if chats else None,
+        delivery_fix_price=(
+            store.delivery_fix.price if store.delivery_fix else None),
+        delivery_distance=(
+            StoreConfigDeliveryDistance(
+                start_price=distance.start_price,
+                price_per_km=distance.price_per_km,
+                min_price=distance.min_price
+            ) if distance else None),
+        delivery_districts=tuple(
+            StoreConfigDeliveryDistrict(
+                id=district.id,
+                name=district.name,
+                price=district.price
+            ) for district in store.delivery_district),
+        working_days=tuple(
+            StoreConfigWorkingDay(
+                day_of_week_id=day.day_of_week_id,
+                number_day=(
+                    day.days_of_week.number_day
+                    if day.days_of_week else None),
+                is_working=day.is_working,
+                opening_time=day.opening_time,
+                closing_time=day.closing_time
+            ) for day in sorted(
+                store.working_days, key=lambda day: day.day_of_week_id)),
+        order_types=tuple(
+            StoreConfigOrderType(
+                order_type_id=association.order_type_id,
+                name=(
+                    association.order_type.name
+                    if association.order_type else None),
+                is_active=association.is_active
+            ) for association in sorted(
+                store.association,
+                key=lambda association: association.order_type_id)),
+    )
+
+
+async def get_store_config(
+    session: AsyncSession,
+    schema: str,
+    store_id: int
+) -> Optional[StoreConfig]:
+    """
+    Неизменяемый снимок настроек магазина: информация, токен бота, чаты,
+    оплата, доставка, рабочие дни и типы заказа. Кэшируется под версией
+    арендатора, которую сбрасывают записи в store/crud.py.
+    """
+    version = await get_store_config_version(schema)
+    key = store_config_key(schema, store_id, version)
+    config = await cache.get(key)
+    if config is not None:
+        return StoreConfig.model_validate(config)
+    config = await load_store_config(session, schema, store_id, version)
+    if config is not None:
+        await cache.set(
+            key, config.model_dump(mode="json"), ttl=settings.STORE_CACHE_TTL)
+    return config
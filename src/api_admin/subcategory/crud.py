@@ -7,6 +7,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
+from src.cache import invalidate_catalog
 from .models import Subcategory
 from .schemas import (
     SubcategoryCreate,
@@ -50,6 +51,7 @@ async def crud_create_new_subcategory(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"status": 201, 'date': data}
 
 
@@ -70,6 +72,7 @@ async def crud_update_subcategory(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"status": "success", 'date': data}
 
 
@@ -91,6 +94,7 @@ async def crud_change_delete_flag_subcategory(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {
         "message": "Статус для deleted_flag изменен"
     }
@@ -116,6 +120,7 @@ async def crud_update_subcategory_field(
     )
     await session.execute(stmt)
     await session.commit()
+    await invalidate_catalog(schema)
     return {"message": f"Статус для {checkbox} изменен"}
 
 
@@ -134,6 +139,7 @@ async def crud_delete_subcategory(
         )
         await session.execute(stmt)
         await session.commit()
+        await invalidate_catalog(schema)
         return {
             "status": "success",
             "message": f"Субкатегория, c id {subcategory_id}, успешно удалена."
@@ -1,9 +1,10 @@
 from fastapi import Depends, HTTPException
 from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.schema import CreateSchema, CreateTable
+from sqlalchemy.schema import CreateIndex, CreateSchema, CreateTable
 
 from src.database import get_async_session
+from src.tenant_migrations import stamp_tenant_schema
 from src.api_admin.models import (
     Store, Category,
     Subcategory, Product,
@@ -61,4 +62,12 @@ async def create_new_schema_and_table(
             CreateTable(table).execution_options(
                 schema_translate_map={None: user_data}
             ))
+        for index in table.indexes:
+            await session.execute(
+                CreateIndex(index).execution_options(
+                    schema_translate_map={None: user_data}
+                ))
+    await session.run_sync(
+        lambda sync_session: stamp_tenant_schema(
+            sync_session.connection(), user_data))
     await session.commit()
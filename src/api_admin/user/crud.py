@@ -1,16 +1,17 @@
 # from sqlalchemy.schema import CreateSchema, CreateTable
-from fastapi import Depends
-from sqlalchemy import insert, select
+from fastapi import Depends, HTTPException
+from sqlalchemy import insert, select, update
 from src.api_admin.models import User
 from .schemas import (
     UserList,
     UserTgId,
-    UserCreate
+    UserCreate,
+    UserUpdatePassword
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_async_session
 from typing import List, Optional
-from src.secure import pwd_context
+from src.secure import hash_password, verify_password
 
 
 async def crud_get_all_users(
@@ -36,14 +37,13 @@ async def crud_register_new_user(
     user_data: UserCreate,
     session: AsyncSession = Depends(get_async_session)
 ):
+    hashed_password = await hash_password(user_data.hashed_password)
     stmt = (
         insert(User).
         values(
             [{
                 'username': user_data.username,
-                'hashed_password': pwd_context.hash(
-                    user_data.hashed_password
-                )}]
+                'hashed_password': hashed_password}]
         ).
         execution_options(schema_translate_map={None: 'public'}).
         returning(User.username, User.id)
@@ -52,6 +52,44 @@ async def crud_register_new_user(
     created_user = result.fetchone()
     await session.commit()
     return {'username': created_user[0], 'user_id': created_user[1]}
+
+
+async def crud_update_user_password(
+    user_id: int,
+    password_data: UserUpdatePassword,
+    session: AsyncSession = Depends(get_async_session)
+):
+    user = await session.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="Пользователь не найден")
+
+    verified, _ = await verify_password(
+        password_data.old_password,
+        user.hashed_password
+    )
+    if not verified:
+        raise HTTPException(
+            status_code=400, detail="Старый пароль введен неверно")
+
+    same_password, _ = await verify_password(
+        password_data.hashed_password,
+        user.hashed_password
+    )
+    if same_password:
+        raise HTTPException(
+            status_code=400,
+            detail="Новый пароль совпадает с текущим паролем"
+        )
+
+    hashed_password = await hash_password(password_data.hashed_password)
+    stmt = (
+        update(User).
+        where(User.id == user_id).
+        values(hashed_password=hashed_password)
+    )
+    await session.execute(stmt)
+    await session.commit()
+    return user.username
     # return users
 
     # await session.commit()
@@ -1,10 +1,14 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_async_session
-from ..auth.routers import create_jwt_token, get_current_user_from_token
+from ..auth.routers import (
+    create_jwt_token,
+    get_current_user_from_token,
+    invalidate_principals
+)
 from .controller import check_duplication, create_new_schema_and_table
 from .models import User
 from .schemas import (
@@ -17,7 +21,8 @@ from .schemas import (
 from .crud import (
     crud_get_all_users,
     crud_get_one_user,
-    crud_register_new_user
+    crud_register_new_user,
+    crud_update_user_password
 )
 
 
@@ -90,7 +95,18 @@ async def update_user_password(
     current_user: User = Depends(get_current_user_from_token),
     session: AsyncSession = Depends(get_async_session)
 ):
-    pass
+    if user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Недостаточно прав")
+    username = await crud_update_user_password(
+        user_id=user_id,
+        password_data=password_data,
+        session=session
+    )
+    await invalidate_principals(username)
+    return {
+        "status": "success",
+        "message": "Пароль пользователя успешно обновлен"
+    }
 
 
 @router.delete(
@@ -3,11 +3,12 @@ from fastapi import HTTPException, Request, APIRouter
 from aiogram.types import Update
 
 from src.database import get_async_session
-from src.config import WEBHOOK_PATH, WEBHOOK_HOST
+from src.config import settings
 
 from src.bot.services import (  # noqa: F401
     dispatchers_by_webhook_url,
     bots,
+    bot_registry,
     create_bot,
     setup_webhook_for_bot
 )
@@ -15,7 +16,7 @@ from src.bot.services import get_info_store_token_all
 
 
 router = APIRouter(
-    prefix=f"{WEBHOOK_PATH}",
+    prefix=f"{settings.WEBHOOK_PATH}",
     tags=["Webhook (telegram_bot)"])
 
 logging.basicConfig(level=logging.INFO)
@@ -32,7 +33,7 @@ async def bot_webhook(request: Request, token: str):
     update = Update(**update_data)
 
     # Построение URL вебхука и поиск пары bot, dp
-    webhook_url = f"{WEBHOOK_HOST}{WEBHOOK_PATH}/{token}"
+    webhook_url = f"{settings.WEBHOOK_HOST}{settings.WEBHOOK_PATH}/{token}"
     pair = dispatchers_by_webhook_url.get(webhook_url)
 
     # Логирование в случае, если бот не найден
@@ -66,7 +67,9 @@ async def on_startup_bot():
         try:
             bot, dp = await create_bot(token)
             bots.append(bot)
-            webhook_url = f"{WEBHOOK_HOST}{WEBHOOK_PATH}/{token}"
+            webhook_url = (
+                f"{settings.WEBHOOK_HOST}{settings.WEBHOOK_PATH}/{token}"
+            )
             dispatchers_by_webhook_url[webhook_url] = (bot, dp)
             await setup_webhook_for_bot(bot, webhook_url)
             logger.info(f"Bot with token {token} started and webhook set")
@@ -76,10 +79,8 @@ async def on_startup_bot():
 
 @router.on_event("shutdown")
 async def on_shutdown_bot():
-    global bots
-    for bot in bots:
-        if bot.session:
-            try:
-                await bot.session.close()
-            except Exception as e:
-                print(f"Ошибка при закрытии сессии бота: {e}")
+    # Все боты используют общую сессию реестра.
+    try:
+        await bot_registry.close()
+    except Exception as e:
+        print(f"Ошибка при закрытии сессии бота: {e}")
@@ -7,6 +7,7 @@ from src.database import get_async_session
 from src.bot.services import get_info_store_token
 from src.api_admin.customer.schemas import CustomerCreate
 from src.api_admin.models import Customer
+from src.api_admin.store.snapshot import get_store_config
 
 
 async def process_start_command(message: types.Message, bot: Bot):
@@ -19,6 +20,10 @@ async def process_start_command(message: types.Message, bot: Bot):
         if bot_token_obj:
             user_id = bot_token_obj.user_id
             store_id = bot_token_obj.store_id
+            store_config = await get_store_config(
+                session, str(user_id), store_id)
+            if store_config and store_config.welcome_message_bot:
+                welcome_message_text = store_config.welcome_message_bot
             if message.text.strip() == "/start":
                 resourse = None
             else:
@@ -2,6 +2,7 @@ from .bot_token_queries import (
     get_info_store_token,
     get_info_store_token_all
 )
+from .bot_registry import bot_registry
 from .webhook_setup import (
     create_bot,
     add_new_bot,
@@ -12,6 +13,7 @@ from .webhook_setup import (
 )
 
 __all__ = [
+    'bot_registry',
     'get_info_store_token',
     'get_info_store_token_all',
     'create_bot',
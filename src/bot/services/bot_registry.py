@@ -0,0 +1,72 @@
+import time
+from typing import Dict, Optional, Set
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+
+from src.config import settings
+
+
+class BotRegistry:
+    """
+    Клиенты aiogram.Bot по токену. Все клиенты используют одну
+    aiohttp-сессию, поэтому соединения с api.telegram.org переиспользуются.
+    Клиенты ботов с вебхуком закреплены, остальные вытесняются
+    после BOT_CLIENT_IDLE_TTL секунд простоя.
+    """
+
+    def __init__(self, idle_ttl: float):
+        self.idle_ttl = idle_ttl
+        self._session: Optional[AiohttpSession] = None
+        self._bots: Dict[str, Bot] = {}
+        self._last_used: Dict[str, float] = {}
+        self._pinned: Set[str] = set()
+        self._last_eviction = time.monotonic()
+
+    @property
+    def session(self) -> AiohttpSession:
+        if self._session is None:
+            self._session = AiohttpSession()
+        return self._session
+
+    def get(self, token: str) -> Bot:
+        now = time.monotonic()
+        bot = self._bots.get(token)
+        if bot is None:
+            bot = Bot(token=token, session=self.session)
+            self._bots[token] = bot
+        self._last_used[token] = now
+        if now - self._last_eviction > self.idle_ttl:
+            self.evict_idle()
+        return bot
+
+    def pin(self, token: str) -> Bot:
+        self._pinned.add(token)
+        return self.get(token)
+
+    def evict_idle(self):
+        now = time.monotonic()
+        self._last_eviction = now
+        for token, last_used in list(self._last_used.items()):
+            if token in self._pinned:
+                continue
+            if now - last_used > self.idle_ttl:
+                self._bots.pop(token, None)
+                self._last_used.pop(token, None)
+
+    async def close(self):
+        self._bots.clear()
+        self._last_used.clear()
+        self._pinned.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self._bots),
+            "pinned": len(self._pinned),
+        }
+
+
+bot_registry = BotRegistry(idle_ttl=settings.BOT_CLIENT_IDLE_TTL)
@@ -1,9 +1,17 @@
+import hashlib
+
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from src.cache import cache
 from src.database import get_async_session
 from src.api_admin.models import BotToken
+from src.api_admin.store.schemas import GetBotToken
+
+
+def bot_token_key(bot_token: str) -> str:
+    return f"bot_token:{hashlib.sha256(bot_token.encode()).hexdigest()}"
 
 
 async def get_info_store_token_all(
@@ -24,12 +32,20 @@ async def get_info_store_token(
     bot_token: str,
     session: AsyncSession = Depends(get_async_session)
 ):
+    key = bot_token_key(bot_token)
+    store = await cache.get(key)
+    if store is not None:
+        return GetBotToken(**store)
     try:
         query = select(BotToken).where(BotToken.token_bot == bot_token)
         result = await session.execute(query)
         store = result.scalar()
-        return store
     except Exception as e:
         await session.rollback()
         raise HTTPException(
             status_code=500, detail=f"An error occurred: {str(e)}")
+    if store is None:
+        return None
+    store = GetBotToken.model_validate(store)
+    await cache.set(key, store.model_dump())
+    return store
@@ -3,6 +3,7 @@ from typing import List, Dict, Tuple
 
 from src.config import settings
 from ..handlers import register_user_commands
+from .bot_registry import bot_registry
 
 
 dispatchers_by_webhook_url: Dict[str, Tuple[Bot, Dispatcher]] = {}
@@ -10,7 +11,7 @@ bots: List[Bot] = []
 
 
 async def create_bot(token: str) -> Tuple[Bot, Dispatcher]:
-    bot = Bot(token)
+    bot = bot_registry.pin(token)
     dp = Dispatcher()
     register_user_commands(dp)
 
@@ -0,0 +1,45 @@
+from src.config import settings
+from .base import Cache
+from .memory import MemoryCache
+
+
+def build_cache() -> Cache:
+    if settings.CACHE_BACKEND == "redis":
+        from .redis_backend import RedisCache
+
+        return Cache(
+            local=MemoryCache(
+                maxsize=settings.CACHE_MAX_SIZE,
+                ttl=settings.CACHE_LOCAL_TTL,
+            ),
+            shared=RedisCache(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                ttl=settings.CACHE_TTL,
+            ),
+        )
+    return Cache(
+        local=MemoryCache(
+            maxsize=settings.CACHE_MAX_SIZE,
+            ttl=settings.CACHE_TTL,
+        ),
+    )
+
+
+cache = build_cache()
+
+
+def catalog_key(schema: str, store_id: int, *parts) -> str:
+    return ":".join(["catalog", schema, str(store_id), *map(str, parts)])
+
+
+async def invalidate_catalog(schema: str):
+    await cache.delete_prefix(f"catalog:{schema}:")
+
+
+def store_key(schema: str, store_id: int) -> str:
+    return f"store:{schema}:{store_id}"
+
+
+async def invalidate_stores(schema: str):
+    await cache.delete_prefix(f"store:{schema}:")
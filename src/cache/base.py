@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Optional
+
+from .memory import MemoryCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class Cache:
+    """
+    Кэш приложения: локальный уровень в памяти процесса и, при наличии,
+    общий бэкенд. Инвалидации публикуются в канал, и каждый воркер
+    удаляет у себя устаревшие записи.
+    """
+
+    channel = "cache:invalidate"
+
+    def __init__(self, local: MemoryCache, shared=None):
+        self.local = local
+        self.shared = shared
+        self.origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.local.get(key)
+        if value is None and self.shared is not None:
+            value = await self.shared.get(key)
+            if value is not None:
+                await self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        local_ttl = ttl
+        if self.shared is not None:
+            local_ttl = min(ttl or self.local.ttl, self.local.ttl)
+        await self.local.set(key, value, local_ttl)
+        if self.shared is not None:
+            await self.shared.set(key, value, ttl)
+
+    async def delete(self, key: str):
+        await self.local.delete(key)
+        if self.shared is not None:
+            await self.shared.delete(key)
+            await self._publish("key", key)
+
+    async def delete_prefix(self, prefix: str):
+        await self.local.delete_prefix(prefix)
+        if self.shared is not None:
+            await self.shared.delete_prefix(prefix)
+            await self._publish("prefix", prefix)
+
+    async def _publish(self, op: str, key: str):
+        await self.shared.publish(
+            self.channel, {"op": op, "key": key, "origin": self.origin})
+
+    async def _listen(self):
+        while True:
+            try:
+                async for message in self.shared.subscribe(self.channel):
+                    if message.get("origin") == self.origin:
+                        continue
+                    if message.get("op") == "prefix":
+                        await self.local.delete_prefix(message["key"])
+                    else:
+                        await self.local.delete(message["key"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener failed: {e}")
+                # Пока подписка не восстановлена, локальные записи
+                # могут устареть, поэтому сбрасываем их целиком.
+                await self.local.delete_prefix("")
+                await asyncio.sleep(1)
+
+    async def start(self):
+        if self.shared is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self.shared is not None:
+            await self.shared.close()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis" if self.shared is not None else "memory",
+            "local": self.local.stats(),
+        }
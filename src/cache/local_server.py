@@ -0,0 +1,245 @@
+"""
+Локальная замена Redis для разработки и проверки нескольких воркеров.
+
+Реализует подмножество протокола RESP, которое использует кэш:
+PING, GET, SET (EX/PX), DEL, INCR, EXPIRE, SCAN, FLUSHALL, CLIENT, SELECT,
+PUBLISH, SUBSCRIBE и UNSUBSCRIBE.
+
+Запуск: python -m src.cache.local_server --port 6379
+"""
+import argparse
+import asyncio
+import logging
+import re
+import time
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def glob_to_regex(pattern: str) -> re.Pattern:
+    result = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            i += 1
+            result.append(re.escape(pattern[i]))
+        elif char == "*":
+            result.append(".*")
+        elif char == "?":
+            result.append(".")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                result.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("^"):
+                    body = "^" + re.escape(body[1:])
+                else:
+                    body = re.escape(body)
+                result.append(f"[{body}]")
+                i = end
+        else:
+            result.append(re.escape(char))
+        i += 1
+    return re.compile("".join(result) + r"\Z", re.S)
+
+
+def encode(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(encode(v) for v in value)
+    raise TypeError(f"Cannot encode {type(value)}")
+
+
+OK = b"+OK\r\n"
+
+
+def error(message: str) -> bytes:
+    return f"-ERR {message}\r\n".encode()
+
+
+class LocalRedisServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379):
+        self.host = host
+        self.port = port
+        self._data: dict[bytes, tuple[bytes, Optional[float]]] = {}
+        self._channels: dict[bytes, set[asyncio.StreamWriter]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        logger.info(f"Local Redis stand-in on {self.host}:{self.port}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def _read_command(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            header = await reader.readline()
+            size = int(header[1:])
+            payload = await reader.readexactly(size + 2)
+            args.append(payload[:-2])
+        return args
+
+    async def _handle_client(self, reader, writer):
+        subscriptions: set[bytes] = set()
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                name = args[0].upper().decode()
+                handler = getattr(self, f"cmd_{name.lower()}", None)
+                if name in ("SUBSCRIBE", "UNSUBSCRIBE"):
+                    reply = self._subscription(
+                        name, args[1:], writer, subscriptions)
+                elif handler is None:
+                    reply = error(f"unknown command '{name}'")
+                else:
+                    try:
+                        reply = handler(*args[1:])
+                    except (TypeError, ValueError, IndexError) as e:
+                        reply = error(str(e))
+                writer.write(reply)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscriptions:
+                self._channels.get(channel, set()).discard(writer)
+            writer.close()
+
+    def _subscription(self, name, channels, writer, subscriptions) -> bytes:
+        reply = b""
+        if name == "UNSUBSCRIBE" and not channels:
+            channels = list(subscriptions)
+        for channel in channels:
+            if name == "SUBSCRIBE":
+                subscriptions.add(channel)
+                self._channels.setdefault(channel, set()).add(writer)
+            else:
+                subscriptions.discard(channel)
+                self._channels.get(channel, set()).discard(writer)
+            reply += encode([name.lower(), channel, len(subscriptions)])
+        return reply
+
+    def cmd_ping(self, message: bytes = None) -> bytes:
+        return encode(message) if message else b"+PONG\r\n"
+
+    def cmd_client(self, *args) -> bytes:
+        return OK
+
+    def cmd_select(self, db: bytes) -> bytes:
+        return OK
+
+    def cmd_get(self, key: bytes) -> bytes:
+        return encode(self._get(key))
+
+    def cmd_set(self, key: bytes, value: bytes, *options) -> bytes:
+        expires_at = None
+        options = [option.upper() for option in options]
+        if b"EX" in options:
+            ttl = float(options[options.index(b"EX") + 1])
+            expires_at = time.monotonic() + ttl
+        elif b"PX" in options:
+            ttl = float(options[options.index(b"PX") + 1]) / 1000
+            expires_at = time.monotonic() + ttl
+        self._data[key] = (value, expires_at)
+        return OK
+
+    def cmd_del(self, *keys) -> bytes:
+        deleted = 0
+        for key in keys:
+            if self._get(key) is not None:
+                deleted += 1
+            self._data.pop(key, None)
+        return encode(deleted)
+
+    def cmd_incr(self, key: bytes) -> bytes:
+        item = self._data.get(key)
+        expires_at = item[1] if item else None
+        value = int(self._get(key) or 0) + 1
+        self._data[key] = (str(value).encode(), expires_at)
+        return encode(value)
+
+    def cmd_expire(self, key: bytes, seconds: bytes) -> bytes:
+        value = self._get(key)
+        if value is None:
+            return encode(0)
+        self._data[key] = (value, time.monotonic() + float(seconds))
+        return encode(1)
+
+    def cmd_scan(self, cursor: bytes, *options) -> bytes:
+        options = list(options)
+        upper = [option.upper() for option in options]
+        pattern = None
+        if b"MATCH" in upper:
+            pattern = glob_to_regex(
+                options[upper.index(b"MATCH") + 1].decode())
+        keys = [
+            key for key in list(self._data)
+            if self._get(key) is not None
+            and (pattern is None or pattern.match(key.decode()))
+        ]
+        return encode([b"0", keys])
+
+    def cmd_flushall(self, *args) -> bytes:
+        self._data.clear()
+        return OK
+
+    def cmd_publish(self, channel: bytes, message: bytes) -> bytes:
+        subscribers = self._channels.get(channel, set())
+        payload = encode([b"message", channel, message])
+        for subscriber in subscribers:
+            subscriber.write(payload)
+        return encode(len(subscribers))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(LocalRedisServer(args.host, args.port).serve_forever())
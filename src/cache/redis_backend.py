@@ -0,0 +1,75 @@
+import json
+from typing import Any, AsyncIterator, Optional
+
+from redis import asyncio as aioredis
+
+
+def escape_pattern(value: str) -> str:
+    for char in "\\*?[]":
+        value = value.replace(char, f"\\{char}")
+    return value
+
+
+class RedisCache:
+    """
+    Общий кэш для всех воркеров поверх Redis (или совместимого сервера).
+    Значения хранятся в JSON.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        ttl: float,
+        namespace: str = "reka",
+    ):
+        self.ttl = ttl
+        self.namespace = namespace
+        self.client = aioredis.Redis(host=host, port=port)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.client.get(self._key(key))
+        if value is None:
+            return None
+        return json.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        await self.client.set(
+            self._key(key),
+            json.dumps(value),
+            px=int((ttl or self.ttl) * 1000),
+        )
+
+    async def delete(self, key: str):
+        await self.client.delete(self._key(key))
+
+    async def delete_prefix(self, prefix: str):
+        pattern = escape_pattern(self._key(prefix)) + "*"
+        keys = []
+        async for key in self.client.scan_iter(match=pattern, count=500):
+            keys.append(key)
+            if len(keys) >= 500:
+                await self.client.delete(*keys)
+                keys = []
+        if keys:
+            await self.client.delete(*keys)
+
+    async def publish(self, channel: str, message: dict):
+        await self.client.publish(self._key(channel), json.dumps(message))
+
+    async def subscribe(self, channel: str) -> AsyncIterator[dict]:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self._key(channel))
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield json.loads(message["data"])
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.close()
+
+    async def close(self):
+        await self.client.close()
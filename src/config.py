@@ -29,11 +29,19 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     PYTHONPATH: str
 
-    # REDIS_HOST: str
-    # REDIS_PORT: int
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+
+    CACHE_BACKEND: str = "memory"
+    CACHE_TTL: int = 300
+    CACHE_LOCAL_TTL: int = 30
+    CACHE_MAX_SIZE: int = 4096
 
     SECRET_KEY_JWT: str
     ALGORITHM: str
+    AUTH_CACHE_TTL: int = 300
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_BCRYPT_ROUNDS: int = 12
 
     DB_HOST: str
     DB_PORT: int
@@ -41,9 +49,53 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASS: str
 
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_SLOW_CHECKOUT_MS: float = 100
+    DB_QUERY_CACHE_SIZE: int = 1000
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    TENANT_MIGRATION_WORKERS: int = 4
+
     MODE: str
 
+    CATALOG_CACHE_TTL: int = 300
+    STORE_CACHE_TTL: int = 300
+
+    REPORT_PAGE_SIZE: int = 100
+    REPORT_MAX_PAGE_SIZE: int = 1000
+    REPORT_STREAM_BATCH_SIZE: int = 500
+
+    OUTBOX_POLL_INTERVAL: float = 5
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_BACKOFF_BASE: float = 2
+    OUTBOX_BACKOFF_MAX: float = 600
+    OUTBOX_LEASE_TIMEOUT: float = 60
+    OUTBOX_RETENTION_DAYS: int = 14
+    OUTBOX_PURGE_INTERVAL: float = 3600
+
+    SCHEDULER_POLL_INTERVAL: float = 30
+    SCHEDULER_BATCH_SIZE: int = 100
+    SCHEDULER_MAX_ATTEMPTS: int = 5
+    SCHEDULER_BACKOFF_BASE: float = 5
+    SCHEDULER_BACKOFF_MAX: float = 600
+    SCHEDULER_LEASE_TIMEOUT: float = 60
+    SCHEDULER_RETENTION_DAYS: int = 7
+    SCHEDULER_PURGE_INTERVAL: float = 3600
+
+    ORDER_KEYBOARD_TTL: int = 10
+
+    BROADCAST_RATE_LIMIT: float = 25
+    BROADCAST_CONCURRENCY: int = 10
+    BROADCAST_PAGE_SIZE: int = 200
+    BROADCAST_MAX_RETRIES: int = 3
+    BROADCAST_JOB_TIME_BUDGET: float = 45
+
     BOT_TOKEN: str
+    BOT_CLIENT_IDLE_TTL: int = 900
 
     WEBHOOK_HOST: str
     WEBHOOK_PATH: str
@@ -53,6 +105,20 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
 
+    STORAGE_BACKEND: str = "s3"
+    STORAGE_LOCAL_ROOT: str = "media"
+    STORAGE_LOCAL_URL: str = "http://localhost:8000/media"
+    S3_MAX_POOL_CONNECTIONS: int = 10
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+    S3_MULTIPART_CONCURRENCY: int = 4
+
+    IMAGE_PROCESS_WORKERS: int = 2
+    IMAGE_MAX_SIZE: int = 900
+    IMAGE_CARD_SIZE: int = 480
+    IMAGE_THUMB_SIZE: int = 200
+    IMAGE_WEBP_QUALITY: int = 80
+
     API_ID: str
     API_KEY: str
 
@@ -4,14 +4,29 @@ from sqlalchemy import MetaData, String, text, ForeignKey
 from sqlalchemy.types import JSON
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, mapped_column
-from sqlalchemy.pool import NullPool
 from src.config import settings
+from src.pool import PoolStats, TimedQueuePool
 
 
 metadata = MetaData()
 
 
-engine = create_async_engine(settings.DB_URL, poolclass=NullPool)
+engine = create_async_engine(
+    settings.DB_URL,
+    poolclass=TimedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args={
+        "prepared_statement_cache_size":
+            settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    },
+)
+engine.pool.stats = PoolStats(
+    slow_checkout_ms=settings.DB_POOL_SLOW_CHECKOUT_MS)
 async_session_maker = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False)
 
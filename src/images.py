@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from PIL import Image
+
+from src.config import settings
+from src.storage import storage
+
+
+executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global executor
+    if executor is None:
+        executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_PROCESS_WORKERS)
+    return executor
+
+
+def shutdown_executor():
+    global executor
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
+
+
+def encode_webp(data: bytes, max_size: int, quality: int) -> bytes:
+    """
+    Выполняется в отдельном процессе: уменьшает картинку и кодирует
+    её в WebP один раз.
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        image.thumbnail((max_size, max_size))
+        with io.BytesIO() as output_buffer:
+            image.save(output_buffer, format="WebP", quality=quality)
+            return output_buffer.getvalue()
+
+
+def encode_webp_variants(
+    data: bytes,
+    sizes: Dict[str, int],
+    quality: int
+) -> Dict[str, bytes]:
+    """
+    Декодирует исходник один раз и кодирует все размеры, начиная
+    с самого большого.
+    """
+    variants = {}
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        for name, size in sorted(
+                sizes.items(), key=lambda item: item[1], reverse=True):
+            image.thumbnail((size, size))
+            with io.BytesIO() as output_buffer:
+                image.save(output_buffer, format="WebP", quality=quality)
+                variants[name] = output_buffer.getvalue()
+    return variants
+
+
+def image_sizes() -> Dict[str, int]:
+    return {
+        "thumb": settings.IMAGE_THUMB_SIZE,
+        "card": settings.IMAGE_CARD_SIZE,
+        "full": settings.IMAGE_MAX_SIZE,
+    }
+
+
+async def process_image(data: bytes) -> bytes:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(),
+        encode_webp,
+        data,
+        settings.IMAGE_MAX_SIZE,
+        settings.IMAGE_WEBP_QUALITY
+    )
+
+
+def variant_url(url: Optional[str], variant: str) -> Optional[str]:
+    """
+    URL другого размера для картинки, загруженной через
+    process_and_upload_variants. Для старых картинок без размеров
+    возвращается исходный URL.
+    """
+    if url and url.endswith("/full.webp"):
+        return f"{url[:-len('full.webp')]}{variant}.webp"
+    return url
+
+
+async def upload_image(body: bytes, object_key: str) -> str:
+    return await storage.put(object_key, body, content_type="image/webp")
+
+
+def variant_keys(object_key: str) -> list[str]:
+    if object_key.endswith("/full.webp"):
+        base_key = object_key[:-len("full.webp")]
+        return [f"{base_key}{name}.webp" for name in image_sizes()]
+    return [object_key]
+
+
+async def process_and_upload_image(data: bytes, object_key: str) -> str:
+    body = await process_image(data)
+    return await upload_image(body, object_key)
+
+
+async def process_and_upload_variants(data: bytes, prefix: str) -> str:
+    """
+    Размеры хранятся под sha256 исходного файла, поэтому повторная
+    загрузка того же файла не кодируется и не загружается заново.
+    full загружается последним и служит признаком полного набора.
+    Возвращает URL размера full.
+    """
+    digest = await asyncio.to_thread(
+        lambda: hashlib.sha256(data).hexdigest())
+    base_key = f"{prefix}/images/{digest}"
+    full_key = f"{base_key}/full.webp"
+    if await storage.exists(full_key):
+        return storage.url(full_key)
+
+    loop = asyncio.get_running_loop()
+    variants = await loop.run_in_executor(
+        get_executor(),
+        encode_webp_variants,
+        data,
+        image_sizes(),
+        settings.IMAGE_WEBP_QUALITY
+    )
+    full = variants.pop("full")
+    await asyncio.gather(*(
+        upload_image(body, f"{base_key}/{name}.webp")
+        for name, body in variants.items()
+    ))
+    return await upload_image(full, full_key)
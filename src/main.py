@@ -1,6 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.api_admin.routers import routers
+from src.api_admin.outbox.worker import outbox_worker
+from src.api_admin.scheduler.worker import scheduler
+from src.cache import cache
+from src.database import engine
+from src.images import shutdown_executor
+from src.pagination import NEXT_CURSOR_HEADER
+from src.storage import storage
 from src.bot.bot import router as bot_router
 
 
@@ -33,6 +40,7 @@ app.add_middleware(
                    "Access-Control-Allow-Headers",
                    "Access-Control-Allow-Origin",
                    "Authorization"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -40,3 +48,40 @@ for router in routers:
     app.include_router(router)
 
 app.include_router(bot_router)
+
+
+@app.on_event("startup")
+async def on_startup_cache():
+    await cache.start()
+
+
+@app.on_event("startup")
+async def on_startup_outbox():
+    await outbox_worker.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown_outbox():
+    await outbox_worker.stop()
+
+
+@app.on_event("startup")
+async def on_startup_scheduler():
+    await scheduler.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown_scheduler():
+    await scheduler.stop()
+
+
+@app.on_event("shutdown")
+async def on_shutdown_images():
+    shutdown_executor()
+    await storage.close()
+
+
+@app.on_event("shutdown")
+async def on_shutdown_database():
+    await cache.close()
+    await engine.dispose()
@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, List, Literal, Optional, Sequence, Type
+
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.config import settings
+from src.database import async_session_maker
+from src.tenancy import tenant_schema, use_tenant
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """
+    Параметры keyset-пагинации по id: cursor - id последней строки
+    предыдущей страницы, следующий курсор возвращается в заголовке
+    X-Next-Cursor. stream отдаёт все строки после курсора потоком
+    NDJSON или CSV без ограничения размера страницы.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[int] = Query(None),
+        limit: int = Query(
+            settings.REPORT_PAGE_SIZE,
+            ge=1,
+            le=settings.REPORT_MAX_PAGE_SIZE
+        ),
+        stream: Optional[Literal["ndjson", "csv"]] = Query(None)
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.stream = stream
+
+
+def keyset_query(
+    query: Select,
+    id_column: InstrumentedAttribute,
+    page: PageParams
+) -> Select:
+    query = query.order_by(id_column.desc())
+    if page.cursor is not None:
+        query = query.where(id_column < page.cursor)
+    return query
+
+
+async def paginate(
+    session: AsyncSession,
+    query: Select,
+    id_column: InstrumentedAttribute,
+    page: PageParams,
+    response: Response
+) -> Sequence:
+    query = keyset_query(query, id_column, page).limit(page.limit + 1)
+    result = await session.execute(query)
+    rows = result.scalars().all()
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(
+            getattr(rows[-1], id_column.key))
+    return rows
+
+
+async def stream_rows(
+    schema: str,
+    query: Select,
+    model: Type[BaseModel]
+) -> AsyncIterator[dict]:
+    # Поток живёт дольше обработчика запроса, поэтому у него своя сессия.
+    # stream_scalars читает строки серверным курсором пачками yield_per.
+    async with async_session_maker() as session:
+        await use_tenant(session, schema)
+        result = await session.stream_scalars(
+            query.execution_options(
+                yield_per=settings.REPORT_STREAM_BATCH_SIZE)
+        )
+        async for row in result:
+            yield model.model_validate(row).model_dump(mode="json")
+
+
+async def ndjson_lines(rows: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+async def csv_lines(
+    rows: AsyncIterator[dict],
+    fields: List[str]
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    async for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_response(
+    session: AsyncSession,
+    query: Select,
+    id_column: InstrumentedAttribute,
+    page: PageParams,
+    model: Type[BaseModel],
+    filename: str
+) -> StreamingResponse:
+    schema = tenant_schema(session)
+    if schema is None:
+        raise HTTPException(
+            status_code=500, detail="Сессия не привязана к схеме")
+    rows = stream_rows(schema, keyset_query(query, id_column, page), model)
+    if page.stream == "csv":
+        return StreamingResponse(
+            csv_lines(rows, list(model.model_fields)),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition":
+                    f'attachment; filename="{filename}.csv"'
+            }
+        )
+    return StreamingResponse(
+        ndjson_lines(rows), media_type="application/x-ndjson")
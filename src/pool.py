@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    def __init__(self, slow_checkout_ms: float):
+        self.slow_checkout_ms = slow_checkout_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.checkout_errors = 0
+        self.slow_checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_last = 0.0
+
+    def observe(self, wait: float, failed: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_last = wait
+            if wait > self.wait_max:
+                self.wait_max = wait
+            if failed:
+                self.checkout_errors += 1
+            if wait * 1000 >= self.slow_checkout_ms:
+                self.slow_checkouts += 1
+                logger.warning(
+                    f"Slow DB connection checkout: {wait * 1000:.1f} ms")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            avg = self.wait_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "checkout_errors": self.checkout_errors,
+                "slow_checkouts": self.slow_checkouts,
+                "wait_avg_ms": round(avg * 1000, 3),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_last_ms": round(self.wait_last * 1000, 3),
+            }
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, замеряющий время ожидания каждой выдачи соединения
+    (очередь пула, создание нового соединения и pre-ping).
+    """
+
+    stats: PoolStats = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except Exception:
+            self.stats.observe(time.perf_counter() - start, failed=True)
+            raise
+        self.stats.observe(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def get_pool_status(pool: TimedQueuePool) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        **pool.stats.snapshot(),
+    }
@@ -1,9 +1,50 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
 from fastapi.security import APIKeyHeader
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from src.config import settings
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
 
 apikey_scheme = APIKeyHeader(name="Authorization")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login/")
+
+# bcrypt отпускает GIL, поэтому потоков достаточно. Пул ограничен, чтобы
+# поток входов не занял все ядра воркера.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password",
+)
+
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.hash, password)
+
+
+async def verify_password(
+    password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Возвращает результат проверки и новый хэш, если текущий создан
+    с устаревшими параметрами и его нужно перезаписать.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor,
+        pwd_context.verify_and_update,
+        password,
+        hashed_password
+    )
@@ -0,0 +1,28 @@
+from src.config import settings
+from .local import LocalStorage
+from .memory import MemoryStorage
+
+
+def build_storage():
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(
+            root=settings.STORAGE_LOCAL_ROOT,
+            base_url=settings.STORAGE_LOCAL_URL,
+        )
+    if settings.STORAGE_BACKEND == "memory":
+        return MemoryStorage()
+    from .s3 import S3Storage
+
+    return S3Storage(
+        bucket=settings.BUCKET_NAME,
+        endpoint_url=settings.ENDPOINT_URL,
+        access_key_id=settings.AWS_ACCESS_KEY_ID,
+        secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+        multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+        multipart_concurrency=settings.S3_MULTIPART_CONCURRENCY,
+    )
+
+
+storage = build_storage()
@@ -0,0 +1,49 @@
+import asyncio
+import os
+from pathlib import Path
+from typing import Optional
+
+
+class LocalStorage:
+    """
+    Хранилище в локальной папке для разработки без бакета.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def _put(self, key: str, body: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+
+    async def put(
+        self,
+        key: str,
+        body: bytes,
+        content_type: Optional[str] = None
+    ) -> str:
+        await asyncio.to_thread(self._put, key, body)
+        return self.url(key)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).exists)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    async def close(self):
+        pass
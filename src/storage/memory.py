@@ -0,0 +1,36 @@
+from typing import Dict, Optional
+
+
+class MemoryStorage:
+    """
+    Хранилище в памяти процесса для проверок без бакета.
+    """
+
+    def __init__(self, base_url: str = "memory://storage"):
+        self.base_url = base_url.rstrip("/")
+        self.objects: Dict[str, bytes] = {}
+        self.content_types: Dict[str, Optional[str]] = {}
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    async def put(
+        self,
+        key: str,
+        body: bytes,
+        content_type: Optional[str] = None
+    ) -> str:
+        self.objects[key] = body
+        self.content_types[key] = content_type
+        return self.url(key)
+
+    async def exists(self, key: str) -> bool:
+        return key in self.objects
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self.objects.pop(key, None)
+            self.content_types.pop(key, None)
+
+    async def close(self):
+        pass
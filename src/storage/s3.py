@@ -0,0 +1,121 @@
+import asyncio
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+
+class S3Storage:
+    """
+    Объектное хранилище S3. boto3 синхронный, поэтому вызовы выполняются
+    в собственном пуле потоков размером с пул соединений клиента.
+    Клиент создаётся при первом обращении, а не при импорте.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str,
+        access_key_id: str,
+        secret_access_key: str,
+        max_pool_connections: int = 10,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        multipart_chunksize: int = 8 * 1024 * 1024,
+        multipart_concurrency: int = 4,
+    ):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self._access_key_id = access_key_id
+        self._secret_access_key = secret_access_key
+        self._config = Config(
+            max_pool_connections=max_pool_connections,
+            retries={"max_attempts": 3, "mode": "standard"},
+        )
+        self._transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=multipart_concurrency,
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_pool_connections,
+            thread_name_prefix="s3",
+        )
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def _get_client(self):
+        with self._client_lock:
+            if self._client is None:
+                self._client = boto3.session.Session().client(
+                    service_name="s3",
+                    endpoint_url=self.endpoint_url,
+                    aws_access_key_id=self._access_key_id,
+                    aws_secret_access_key=self._secret_access_key,
+                    config=self._config,
+                )
+            return self._client
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: func(*args, **kwargs))
+
+    def url(self, key: str) -> str:
+        return f"{self.endpoint_url}/{self.bucket}/{key}"
+
+    def _put(self, key: str, body: bytes, content_type: Optional[str]):
+        extra_args = {"ContentType": content_type} if content_type else None
+        self._get_client().upload_fileobj(
+            io.BytesIO(body),
+            self.bucket,
+            key,
+            ExtraArgs=extra_args,
+            Config=self._transfer_config,
+        )
+
+    async def put(
+        self,
+        key: str,
+        body: bytes,
+        content_type: Optional[str] = None
+    ) -> str:
+        await self._run(self._put, key, body, content_type)
+        return self.url(key)
+
+    def _exists(self, key: str) -> bool:
+        try:
+            self._get_client().head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    async def exists(self, key: str) -> bool:
+        return await self._run(self._exists, key)
+
+    def _delete(self, keys: list[str]):
+        client = self._get_client()
+        for start in range(0, len(keys), 1000):
+            client.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    "Objects": [
+                        {"Key": key} for key in keys[start:start + 1000]
+                    ],
+                    "Quiet": True,
+                },
+            )
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._run(self._delete, list(keys))
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,133 @@
+import threading
+from typing import AsyncGenerator, Optional
+
+from fastapi import Depends, HTTPException
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHING_DISABLED,
+    NO_CACHE_KEY
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.database import engine, get_async_session
+
+
+TENANT_SCHEMA = "tenant_schema"
+
+
+# Схема передаётся параметром, чтобы и это выражение было одним
+# подготовленным выражением для всех арендаторов.
+set_search_path = text("SELECT set_config('search_path', :search_path, true)")
+
+
+def validate_schema(schema: str) -> str:
+    # Схема арендатора - это id пользователя.
+    if not schema.isdigit():
+        raise ValueError(f"Invalid tenant schema: {schema!r}")
+    return schema
+
+
+@event.listens_for(Session, "after_begin")
+def set_tenant_search_path(session, transaction, connection):
+    schema = session.info.get(TENANT_SCHEMA)
+    if schema is not None:
+        connection.execute(set_search_path, {"search_path": f'"{schema}"'})
+
+
+async def use_tenant(session: AsyncSession, schema: str):
+    """
+    Привязывает сессию к схеме арендатора. Каждая транзакция сессии
+    начинается с SET LOCAL search_path, поэтому таблицы со схемой None
+    не нужно переводить через schema_translate_map. Текст SQL получается
+    одинаковым для всех арендаторов, и подготовленные выражения asyncpg
+    переиспользуются между ними.
+    """
+    if session.info.get(TENANT_SCHEMA) == schema:
+        return
+    session.info[TENANT_SCHEMA] = validate_schema(schema)
+    if session.in_transaction():
+        await session.execute(
+            set_search_path, {"search_path": f'"{schema}"'})
+
+
+def tenant_schema(session: AsyncSession) -> Optional[str]:
+    return session.info.get(TENANT_SCHEMA)
+
+
+async def get_schema_session(
+    schema: str,
+    session: AsyncSession = Depends(get_async_session)
+) -> AsyncGenerator[AsyncSession, None]:
+    try:
+        await use_tenant(session, schema)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    yield session
+
+
+class StatementStats:
+    """
+    Счётчики кэша скомпилированных выражений SQLAlchemy и число
+    различных текстов SQL, отправленных в базу. schema_translated -
+    выполнения через schema_translate_map: их текст содержит схему, и
+    кэш подготовленных выражений asyncpg для них не общий между
+    арендаторами.
+    """
+
+    max_tracked_statements = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.schema_translated = 0
+        self._statements = set()
+
+    def observe(self, context, statement: str):
+        cache_hit = getattr(context, "cache_hit", None)
+        with self._lock:
+            if cache_hit == CACHE_HIT:
+                self.hits += 1
+            elif cache_hit == CACHE_MISS:
+                self.misses += 1
+            elif cache_hit in (CACHING_DISABLED, NO_CACHE_KEY):
+                self.uncached += 1
+            if context.execution_options.get("schema_translate_map"):
+                self.schema_translated += 1
+            if len(self._statements) < self.max_tracked_statements:
+                self._statements.add(statement)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cached = self.hits + self.misses
+            return {
+                "compiled_cache_hits": self.hits,
+                "compiled_cache_misses": self.misses,
+                "compiled_cache_hit_rate": (
+                    round(self.hits / cached, 4) if cached else 0.0),
+                "uncached": self.uncached,
+                "schema_translated": self.schema_translated,
+                "distinct_statements": len(self._statements),
+            }
+
+
+def track_statements(engine: Engine) -> StatementStats:
+    stats = StatementStats()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def observe(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            stats.observe(context, statement)
+
+    return stats
+
+
+statement_stats = track_statements(engine.sync_engine)
@@ -0,0 +1,150 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, pool, text
+from sqlalchemy.engine import Connection
+
+from src.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+# Секция alembic.ini с ревизиями схем арендаторов. Ревизии пишутся для
+# таблиц без схемы, env.py выполняет их с search_path на схему
+# арендатора, а версия хранится в alembic_version этой схемы.
+TENANT_SECTION = "tenant"
+
+list_tenant_schemas_query = text(
+    "SELECT n.nspname FROM pg_namespace n "
+    "JOIN public.users u ON n.nspname = u.id::text "
+    "WHERE to_regclass(quote_ident(n.nspname) || '.stores') IS NOT NULL "
+    "ORDER BY u.id"
+)
+
+
+def tenant_config(schema: Optional[str] = None) -> Config:
+    config = Config(str(ALEMBIC_INI), ini_section=TENANT_SECTION)
+    config.set_main_option(
+        "script_location", str(ALEMBIC_INI.parent / "migrations" / "tenant"))
+    config.attributes["configure_logger"] = False
+    if schema is not None:
+        config.attributes["tenant_schema"] = schema
+    return config
+
+
+@lru_cache
+def tenant_script() -> ScriptDirectory:
+    return ScriptDirectory.from_config(tenant_config())
+
+
+def stamp_tenant_schema(connection: Connection, schema: str, revision="heads"):
+    """
+    Записывает версию в alembic_version схемы арендатора. Новые схемы
+    создаются по текущим моделям и сразу помечаются последней ревизией,
+    чтобы раннер не применял к ним уже учтённые изменения.
+    """
+    context = MigrationContext.configure(
+        connection, opts={"version_table_schema": schema})
+    context.stamp(tenant_script(), revision)
+
+
+def sync_db_url() -> str:
+    return f"{settings.DB_URL}?async_fallback=True"
+
+
+def list_tenant_schemas() -> List[str]:
+    engine = create_engine(sync_db_url(), poolclass=pool.NullPool)
+    try:
+        with engine.connect() as connection:
+            return connection.execute(
+                list_tenant_schemas_query).scalars().all()
+    finally:
+        engine.dispose()
+
+
+@dataclass
+class TenantMigrationResult:
+    schema: str
+    from_revision: Optional[str]
+    to_revision: Optional[str]
+    error: Optional[str] = None
+
+
+def current_revision(connection: Connection, schema: str) -> Optional[str]:
+    context = MigrationContext.configure(
+        connection, opts={"version_table_schema": schema})
+    return context.get_current_revision()
+
+
+def upgrade_tenant_schema(
+    schema: str,
+    revision: str = "heads"
+) -> TenantMigrationResult:
+    """
+    Обновляет одну схему арендатора. Выполняется в отдельном процессе:
+    контекст alembic глобальный для процесса. Схемы без alembic_version
+    созданы до появления ревизий арендаторов и помечаются базовой
+    ревизией, с которой совпадают.
+    """
+    engine = create_engine(sync_db_url(), poolclass=pool.NullPool)
+    from_revision = None
+    try:
+        with engine.begin() as connection:
+            from_revision = current_revision(connection, schema)
+            if from_revision is None:
+                base = tenant_script().get_base()
+                stamp_tenant_schema(connection, schema, base)
+        command.upgrade(tenant_config(schema), revision)
+        with engine.connect() as connection:
+            to_revision = current_revision(connection, schema)
+        return TenantMigrationResult(schema, from_revision, to_revision)
+    except Exception as e:
+        logger.exception(f"Tenant schema {schema} migration failed")
+        return TenantMigrationResult(
+            schema, from_revision, None, error=str(e))
+    finally:
+        engine.dispose()
+
+
+def upgrade_tenant_schemas(
+    revision: str = "heads",
+    schemas: Optional[List[str]] = None,
+    workers: Optional[int] = None
+) -> List[TenantMigrationResult]:
+    """
+    Применяет ревизии ко всем схемам арендаторов параллельно, не больше
+    workers соединений одновременно. Каждая схема мигрирует в своей
+    транзакции, ошибка в одной не останавливает остальные. Повторный
+    запуск продолжает с версий, записанных в схемах.
+    """
+    if schemas is None:
+        schemas = list_tenant_schemas()
+    workers = workers or settings.TENANT_MIGRATION_WORKERS
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(upgrade_tenant_schema, schema, revision)
+            for schema in schemas
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result.error:
+                logger.error(
+                    f"{result.schema}: failed: {result.error}")
+            else:
+                logger.info(
+                    f"{result.schema}: "
+                    f"{result.from_revision} -> {result.to_revision}")
+    return results